@@ -0,0 +1,51 @@
+"""add track rating and review composite indexes
+
+Revision ID: a4c7e2b91f35
+Revises: d66f0f4188d4
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2b91f35'
+down_revision: Union[str, None] = 'd66f0f4188d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently so the tables stay writable while the indexes are created
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_track_ratings_track_id_rating',
+            'track_ratings',
+            ['track_id', 'rating'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_track_reviews_track_id_public_created',
+            'track_reviews',
+            ['track_id', 'is_public', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_track_reviews_track_id_public_created',
+            table_name='track_reviews',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_track_ratings_track_id_rating',
+            table_name='track_ratings',
+            postgresql_concurrently=True,
+        )
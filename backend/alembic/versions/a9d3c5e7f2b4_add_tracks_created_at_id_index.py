@@ -0,0 +1,52 @@
+"""add tracks created_at id index
+
+Revision ID: a9d3c5e7f2b4
+Revises: f1c6d8a3b5e2
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3c5e7f2b4'
+down_revision: Union[str, None] = 'f1c6d8a3b5e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (created_at, id) serves keyset pagination and supersedes the
+    # created_at-only index. Built concurrently so tracks stay writable.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tracks_created_at_id',
+            'tracks',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tracks_created_at',
+            table_name='tracks',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tracks_created_at',
+            'tracks',
+            ['created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tracks_created_at_id',
+            table_name='tracks',
+            postgresql_concurrently=True,
+        )
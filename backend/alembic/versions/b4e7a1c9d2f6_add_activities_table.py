@@ -0,0 +1,106 @@
+"""add activities table
+
+Revision ID: b4e7a1c9d2f6
+Revises: a9d3c5e7f2b4
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e7a1c9d2f6'
+down_revision: Union[str, None] = 'a9d3c5e7f2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Feed sources: (activity type, table, user column, flag column or None).
+# Rows only appear in the feed while the flag column is true.
+ACTIVITY_SOURCES = [
+    ('set_review', 'reviews', 'user_id', 'is_public'),
+    ('set_rating', 'ratings', 'user_id', None),
+    ('track_review', 'track_reviews', 'user_id', 'is_public'),
+    ('track_rating', 'track_ratings', 'user_id', None),
+    ('top_track', 'user_top_tracks', 'user_id', None),
+    ('top_set', 'user_set_logs', 'user_id', 'is_top_set'),
+    ('event_created', 'events', 'created_by_id', None),
+    ('event_confirmed', 'event_confirmations', 'user_id', None),
+]
+
+# Replaces a source row's activity on every change. Trigger arguments are the
+# activity type, the user column and optionally the flag column.
+SYNC_FUNCTION = """
+    CREATE OR REPLACE FUNCTION sync_activity() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        new_row jsonb;
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            DELETE FROM activities WHERE activity_type = TG_ARGV[0] AND source_id = OLD.id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            new_row := to_jsonb(NEW);
+            IF TG_NARGS < 3 OR (new_row ->> TG_ARGV[2])::boolean THEN
+                INSERT INTO activities (activity_type, source_id, user_id, created_at)
+                VALUES (TG_ARGV[0], NEW.id, (new_row ->> TG_ARGV[1])::uuid, NEW.created_at);
+            END IF;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+"""
+
+
+def _trigger(activity_type: str, table: str, user_column: str, flag_column) -> str:
+    columns = [user_column, 'created_at'] + ([flag_column] if flag_column else [])
+    arguments = [activity_type, user_column] + ([flag_column] if flag_column else [])
+    return f"""
+        CREATE TRIGGER activity_{activity_type}
+        AFTER INSERT OR DELETE OR UPDATE OF {', '.join(columns)} ON {table}
+        FOR EACH ROW EXECUTE FUNCTION sync_activity({', '.join(f"'{a}'" for a in arguments)})
+    """
+
+
+def _backfill(activity_type: str, table: str, user_column: str, flag_column) -> str:
+    return f"""
+        INSERT INTO activities (activity_type, source_id, user_id, created_at)
+        SELECT '{activity_type}', id, {user_column}, created_at FROM {table}
+        {f'WHERE {flag_column}' if flag_column else ''}
+    """
+
+
+TRIGGERS = [_trigger(*source) for source in ACTIVITY_SOURCES]
+
+# Runs after the triggers exist and in the same transaction, so no write can
+# slip between the snapshot and the triggers
+BACKFILL = [_backfill(*source) for source in ACTIVITY_SOURCES]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'activities',
+        sa.Column('activity_type', sa.String(length=20), primary_key=True),
+        sa.Column('source_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    # The feed orders by created_at and then the primary key, so ties page deterministically
+    op.create_index('ix_activities_created_at_key', 'activities', ['created_at', 'activity_type', 'source_id'], unique=False)
+    op.create_index('ix_activities_user_id_created_at', 'activities', ['user_id', 'created_at'], unique=False)
+
+    op.execute(SYNC_FUNCTION)
+    for statement in TRIGGERS + BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for activity_type, table, _, _ in reversed(ACTIVITY_SOURCES):
+        op.execute(f"DROP TRIGGER IF EXISTS activity_{activity_type} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS sync_activity()")
+    op.drop_index('ix_activities_user_id_created_at', table_name='activities')
+    op.drop_index('ix_activities_created_at_key', table_name='activities')
+    op.drop_table('activities')
@@ -0,0 +1,38 @@
+"""cascade set track confirmations on delete
+
+Revision ID: b7d31f0c5e2a
+Revises: a4c7e2b91f35
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d31f0c5e2a'
+down_revision: Union[str, None] = 'a4c7e2b91f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Deleting a SetTrack removes its confirmations in the same statement
+    op.drop_constraint('track_confirmations_track_id_fkey', 'track_confirmations', type_='foreignkey')
+    op.create_foreign_key(
+        'track_confirmations_track_id_fkey',
+        'track_confirmations', 'set_tracks',
+        ['track_id'], ['id'],
+        ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('track_confirmations_track_id_fkey', 'track_confirmations', type_='foreignkey')
+    op.create_foreign_key(
+        'track_confirmations_track_id_fkey',
+        'track_confirmations', 'set_tracks',
+        ['track_id'], ['id']
+    )
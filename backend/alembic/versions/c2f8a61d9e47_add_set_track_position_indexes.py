@@ -0,0 +1,51 @@
+"""add set track position indexes
+
+Revision ID: c2f8a61d9e47
+Revises: b7d31f0c5e2a
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8a61d9e47'
+down_revision: Union[str, None] = 'b7d31f0c5e2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently so the tables stay writable while the indexes are created
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_set_tracks_set_id_position_created',
+            'set_tracks',
+            ['set_id', 'position', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_track_set_links_set_id_position_created',
+            'track_set_links',
+            ['set_id', 'position', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_track_set_links_set_id_position_created',
+            table_name='track_set_links',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_set_tracks_set_id_position_created',
+            table_name='set_tracks',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,38 @@
+"""cascade track set link confirmations on delete
+
+Revision ID: d5a9e3c7b1f4
+Revises: c2f8a61d9e47
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9e3c7b1f4'
+down_revision: Union[str, None] = 'c2f8a61d9e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Deleting a TrackSetLink removes its confirmations in the same statement
+    op.drop_constraint('track_confirmations_track_set_link_id_fkey', 'track_confirmations', type_='foreignkey')
+    op.create_foreign_key(
+        'track_confirmations_track_set_link_id_fkey',
+        'track_confirmations', 'track_set_links',
+        ['track_set_link_id'], ['id'],
+        ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('track_confirmations_track_set_link_id_fkey', 'track_confirmations', type_='foreignkey')
+    op.create_foreign_key(
+        'track_confirmations_track_set_link_id_fkey',
+        'track_confirmations', 'track_set_links',
+        ['track_set_link_id'], ['id']
+    )
@@ -0,0 +1,55 @@
+"""add trigram search indexes
+
+Revision ID: e8b4f2a6c3d1
+Revises: d5a9e3c7b1f4
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4f2a6c3d1'
+down_revision: Union[str, None] = 'd5a9e3c7b1f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, column) for every column searched with ILIKE '%...%'
+TRIGRAM_INDEXES = (
+    ('ix_tracks_track_name_trgm', 'tracks', 'track_name'),
+    ('ix_tracks_artist_name_trgm', 'tracks', 'artist_name'),
+    ('ix_users_username_trgm', 'users', 'username'),
+    ('ix_users_display_name_trgm', 'users', 'display_name'),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    # Build concurrently so the tables stay writable while the indexes are created
+    with op.get_context().autocommit_block():
+        for index_name, table_name, column_name in TRIGRAM_INDEXES:
+            op.create_index(
+                index_name,
+                table_name,
+                [column_name],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column_name: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    # The pg_trgm extension is left installed; other objects may depend on it
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+            )
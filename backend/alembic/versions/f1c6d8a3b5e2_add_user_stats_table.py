@@ -0,0 +1,242 @@
+"""add user stats table
+
+Revision ID: f1c6d8a3b5e2
+Revises: e8b4f2a6c3d1
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6d8a3b5e2'
+down_revision: Union[str, None] = 'e8b4f2a6c3d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Adds deltas to a user's counters, creating the row on first use. The
+# users lookup skips users deleted earlier in the same statement.
+BUMP_FUNCTION = """
+    CREATE OR REPLACE FUNCTION bump_user_stats(
+        p_user_id uuid,
+        p_sets integer DEFAULT 0,
+        p_reviews integer DEFAULT 0,
+        p_lists integer DEFAULT 0,
+        p_following integer DEFAULT 0,
+        p_followers integer DEFAULT 0,
+        p_rating_sum double precision DEFAULT 0,
+        p_rating_count integer DEFAULT 0,
+        p_minutes integer DEFAULT 0
+    ) RETURNS void LANGUAGE sql AS $$
+        INSERT INTO user_stats (
+            user_id, sets_logged, reviews_written, lists_created,
+            following_count, followers_count, rating_sum, rating_count, minutes_listened
+        )
+        SELECT id, p_sets, p_reviews, p_lists, p_following, p_followers,
+               p_rating_sum, p_rating_count, p_minutes
+        FROM users WHERE id = p_user_id
+        ON CONFLICT (user_id) DO UPDATE SET
+            sets_logged = user_stats.sets_logged + EXCLUDED.sets_logged,
+            reviews_written = user_stats.reviews_written + EXCLUDED.reviews_written,
+            lists_created = user_stats.lists_created + EXCLUDED.lists_created,
+            following_count = user_stats.following_count + EXCLUDED.following_count,
+            followers_count = user_stats.followers_count + EXCLUDED.followers_count,
+            rating_sum = user_stats.rating_sum + EXCLUDED.rating_sum,
+            rating_count = user_stats.rating_count + EXCLUDED.rating_count,
+            minutes_listened = user_stats.minutes_listened + EXCLUDED.minutes_listened
+    $$
+"""
+
+TRIGGER_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION user_stats_on_set_log() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            PERFORM bump_user_stats(OLD.user_id, p_sets => -1, p_minutes => -COALESCE(
+                (SELECT duration_minutes FROM dj_sets WHERE id = OLD.set_id), 0));
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM bump_user_stats(NEW.user_id, p_sets => 1, p_minutes => COALESCE(
+                (SELECT duration_minutes FROM dj_sets WHERE id = NEW.set_id), 0));
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_stats_on_set_duration() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE user_stats
+        SET minutes_listened = user_stats.minutes_listened
+            + COALESCE(NEW.duration_minutes, 0) - COALESCE(OLD.duration_minutes, 0)
+        FROM user_set_logs
+        WHERE user_set_logs.set_id = NEW.id AND user_stats.user_id = user_set_logs.user_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_stats_on_review() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            PERFORM bump_user_stats(OLD.user_id, p_reviews => -1);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM bump_user_stats(NEW.user_id, p_reviews => 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_stats_on_list() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            PERFORM bump_user_stats(OLD.user_id, p_lists => -1);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM bump_user_stats(NEW.user_id, p_lists => 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_stats_on_rating() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            PERFORM bump_user_stats(OLD.user_id, p_rating_sum => -OLD.rating, p_rating_count => -1);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM bump_user_stats(NEW.user_id, p_rating_sum => NEW.rating, p_rating_count => 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    # Both sides of a follow are bumped in user id order so that A->B and
+    # B->A written concurrently lock the two rows in the same order
+    """
+    CREATE OR REPLACE FUNCTION user_stats_on_follow() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            IF OLD.follower_id < OLD.following_id THEN
+                PERFORM bump_user_stats(OLD.follower_id, p_following => -1);
+                PERFORM bump_user_stats(OLD.following_id, p_followers => -1);
+            ELSE
+                PERFORM bump_user_stats(OLD.following_id, p_followers => -1);
+                PERFORM bump_user_stats(OLD.follower_id, p_following => -1);
+            END IF;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            IF NEW.follower_id < NEW.following_id THEN
+                PERFORM bump_user_stats(NEW.follower_id, p_following => 1);
+                PERFORM bump_user_stats(NEW.following_id, p_followers => 1);
+            ELSE
+                PERFORM bump_user_stats(NEW.following_id, p_followers => 1);
+                PERFORM bump_user_stats(NEW.follower_id, p_following => 1);
+            END IF;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+]
+
+TRIGGERS = [
+    """
+    CREATE TRIGGER user_stats_set_log
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, set_id ON user_set_logs
+    FOR EACH ROW EXECUTE FUNCTION user_stats_on_set_log()
+    """,
+    """
+    CREATE TRIGGER user_stats_set_duration
+    AFTER UPDATE OF duration_minutes ON dj_sets
+    FOR EACH ROW WHEN (OLD.duration_minutes IS DISTINCT FROM NEW.duration_minutes)
+    EXECUTE FUNCTION user_stats_on_set_duration()
+    """,
+    """
+    CREATE TRIGGER user_stats_review
+    AFTER INSERT OR DELETE OR UPDATE OF user_id ON reviews
+    FOR EACH ROW EXECUTE FUNCTION user_stats_on_review()
+    """,
+    """
+    CREATE TRIGGER user_stats_list
+    AFTER INSERT OR DELETE OR UPDATE OF user_id ON lists
+    FOR EACH ROW EXECUTE FUNCTION user_stats_on_list()
+    """,
+    """
+    CREATE TRIGGER user_stats_rating
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, rating ON ratings
+    FOR EACH ROW EXECUTE FUNCTION user_stats_on_rating()
+    """,
+    """
+    CREATE TRIGGER user_stats_follow
+    AFTER INSERT OR DELETE OR UPDATE OF follower_id, following_id ON follows
+    FOR EACH ROW EXECUTE FUNCTION user_stats_on_follow()
+    """,
+]
+
+# Seed every existing user; runs after the triggers exist and in the same
+# transaction, so no write can slip between the snapshot and the triggers
+BACKFILL = """
+    INSERT INTO user_stats (
+        user_id, sets_logged, reviews_written, lists_created,
+        following_count, followers_count, rating_sum, rating_count, minutes_listened
+    )
+    SELECT
+        users.id,
+        (SELECT count(*) FROM user_set_logs WHERE user_set_logs.user_id = users.id),
+        (SELECT count(*) FROM reviews WHERE reviews.user_id = users.id),
+        (SELECT count(*) FROM lists WHERE lists.user_id = users.id),
+        (SELECT count(*) FROM follows WHERE follows.follower_id = users.id),
+        (SELECT count(*) FROM follows WHERE follows.following_id = users.id),
+        (SELECT COALESCE(sum(rating), 0) FROM ratings WHERE ratings.user_id = users.id),
+        (SELECT count(*) FROM ratings WHERE ratings.user_id = users.id),
+        (SELECT COALESCE(sum(dj_sets.duration_minutes), 0)
+         FROM user_set_logs JOIN dj_sets ON dj_sets.id = user_set_logs.set_id
+         WHERE user_set_logs.user_id = users.id)
+    FROM users
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('sets_logged', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('reviews_written', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('lists_created', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('following_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('followers_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('rating_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('minutes_listened', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    op.execute(BUMP_FUNCTION)
+    for statement in TRIGGER_FUNCTIONS + TRIGGERS:
+        op.execute(statement)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS user_stats_follow ON follows")
+    op.execute("DROP TRIGGER IF EXISTS user_stats_rating ON ratings")
+    op.execute("DROP TRIGGER IF EXISTS user_stats_list ON lists")
+    op.execute("DROP TRIGGER IF EXISTS user_stats_review ON reviews")
+    op.execute("DROP TRIGGER IF EXISTS user_stats_set_duration ON dj_sets")
+    op.execute("DROP TRIGGER IF EXISTS user_stats_set_log ON user_set_logs")
+    op.execute("DROP FUNCTION IF EXISTS user_stats_on_follow()")
+    op.execute("DROP FUNCTION IF EXISTS user_stats_on_rating()")
+    op.execute("DROP FUNCTION IF EXISTS user_stats_on_list()")
+    op.execute("DROP FUNCTION IF EXISTS user_stats_on_review()")
+    op.execute("DROP FUNCTION IF EXISTS user_stats_on_set_duration()")
+    op.execute("DROP FUNCTION IF EXISTS user_stats_on_set_log()")
+    op.execute("DROP FUNCTION IF EXISTS bump_user_stats(uuid, integer, integer, integer, integer, integer, double precision, integer, integer)")
+    op.drop_table('user_stats')
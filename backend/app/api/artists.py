@@ -5,8 +5,7 @@ Handles artist profile viewing and editing.
 Artists are auto-created from Spotify data when tracks are imported.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_
 from uuid import UUID
@@ -14,31 +13,12 @@ from typing import Optional, List
 
 from app.database import get_db
 from app.models import Artist, Track, DJSet, Event, User
+from app.services.spotify_search import search_spotify_artist_by_name
 from app.schemas import ArtistResponse, ArtistDetailResponse, ArtistUpdate, TrackResponse, DJSetResponse, EventResponse
 from app.auth import get_current_active_user
 
 router = APIRouter(prefix="/api/artists", tags=["artists"])
 
-security = HTTPBearer(auto_error=False)
-
-
-async def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(security),
-    db: AsyncSession = Depends(get_db)
-) -> Optional[User]:
-    if not credentials:
-        return None
-    try:
-        from jose import jwt
-        from app.config import settings
-        payload = jwt.decode(credentials.credentials, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        user_id: Optional[str] = payload.get("sub")
-        if user_id is None:
-            return None
-        result = await db.execute(select(User).where(User.id == UUID(user_id)))
-        return result.scalar_one_or_none()
-    except Exception:
-        return None
 
 
 @router.get("", response_model=List[ArtistResponse])
@@ -72,7 +52,6 @@ async def get_artist_by_name(
         return ArtistResponse.model_validate(artist)
 
     # Not in DB — try to import from Spotify
-    from app.services.spotify_search import search_spotify_artist_by_name
     spotify_artist = await search_spotify_artist_by_name(name)
     if not spotify_artist or not spotify_artist.get("spotify_artist_id"):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artist not found")
@@ -181,49 +160,3 @@ async def update_artist(
     await db.refresh(artist)
     return ArtistResponse.model_validate(artist)
 
-
-async def ensure_artists_from_spotify(
-    artist_ids: List[str],
-    db: AsyncSession,
-) -> List[Artist]:
-    """
-    Given a list of Spotify artist IDs, ensure each has an Artist row.
-    Fetches missing artists from Spotify API and creates them.
-    Returns the list of Artist objects.
-    """
-    if not artist_ids:
-        return []
-
-    # Find which already exist
-    existing_result = await db.execute(
-        select(Artist).where(Artist.spotify_artist_id.in_(artist_ids))
-    )
-    existing = {a.spotify_artist_id: a for a in existing_result.scalars().all()}
-
-    missing_ids = [aid for aid in artist_ids if aid not in existing]
-    if not missing_ids:
-        return list(existing.values())
-
-    # Fetch missing from Spotify
-    from app.services.spotify_search import get_artists_batch
-    spotify_artists = await get_artists_batch(missing_ids)
-
-    new_artists = []
-    for sa in spotify_artists:
-        if sa["spotify_artist_id"] in existing:
-            continue
-        artist = Artist(
-            name=sa["name"],
-            spotify_artist_id=sa["spotify_artist_id"],
-            spotify_url=sa.get("spotify_url"),
-            image_url=sa.get("image_url"),
-            genres=sa.get("genres"),
-        )
-        db.add(artist)
-        new_artists.append(artist)
-        existing[sa["spotify_artist_id"]] = artist
-
-    if new_artists:
-        await db.flush()
-
-    return list(existing.values())
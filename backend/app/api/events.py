@@ -21,6 +21,7 @@ from app.schemas import (
     PaginatedResponse
 )
 from app.auth import get_current_active_user
+from app.core.cache import invalidate_activity_feed_cache
 from app.core.exceptions import SetNotFoundError, ForbiddenError, ExternalAPIError
 from app.config import settings
 import app.services.ra as ra_service
@@ -149,6 +150,7 @@ async def create_event(
     
     db.add(new_event)
     await db.commit()
+    invalidate_activity_feed_cache()
     await db.refresh(new_event)
     
     return new_event
@@ -215,6 +217,7 @@ async def delete_event(
     
     await db.delete(event_obj)
     await db.commit()
+    invalidate_activity_feed_cache()
     
     return None
 
@@ -447,6 +450,7 @@ async def create_event_from_set(
         
         db.add(new_event)
         await db.commit()
+        invalidate_activity_feed_cache()
         await db.refresh(new_event)
 
         return new_event
@@ -562,6 +566,7 @@ async def _get_or_create_event(db: AsyncSession, parsed: dict, current_user: Use
     )
     db.add(new_event)
     await db.commit()
+    invalidate_activity_feed_cache()
     await db.refresh(new_event)
     return new_event
 
@@ -696,6 +701,7 @@ async def mark_attended(
 
     db.add(EventConfirmation(user_id=current_user.id, event_id=event_id))
     await db.commit()
+    invalidate_activity_feed_cache()
     return {"attended": True}
 
 
@@ -716,6 +722,7 @@ async def unmark_attended(
     if confirmation:
         await db.delete(confirmation)
         await db.commit()
+        invalidate_activity_feed_cache()
 
 
 @router.get("/users/{user_id}/confirmed", response_model=PaginatedResponse)
@@ -14,6 +14,7 @@ from app.database import get_db
 from app.models import UserSetLog, User, DJSet, SourceType
 from app.schemas import LogCreate, LogUpdate, LogResponse, PaginatedResponse
 from app.auth import get_current_active_user
+from app.core.cache import invalidate_activity_feed_cache
 from app.core.exceptions import DuplicateEntryError
 
 router = APIRouter(prefix="/api/logs", tags=["logs"])
@@ -143,6 +144,7 @@ async def set_top_set(
     log.top_set_order = order
     
     await db.commit()
+    invalidate_activity_feed_cache()
     await db.refresh(log, ["set"])
     
     # Convert to response schema
@@ -187,6 +189,7 @@ async def unset_top_set(
     log.top_set_order = None
     
     await db.commit()
+    invalidate_activity_feed_cache()
     
     return None
 
@@ -389,6 +392,7 @@ async def delete_log(
     
     await db.delete(log_obj)
     await db.commit()
+    invalidate_activity_feed_cache()
     
     return None
 
@@ -15,6 +15,7 @@ from app.database import get_db
 from app.models import Rating, User, DJSet
 from app.schemas import RatingCreate, RatingUpdate, RatingResponse, RatingStats
 from app.auth import get_current_active_user
+from app.core.cache import invalidate_activity_feed_cache
 from app.core.exceptions import SetNotFoundError
 
 router = APIRouter(prefix="/api/ratings", tags=["ratings"])
@@ -47,6 +48,7 @@ async def create_rating(
         # Update existing rating
         existing_rating.rating = rating_data.rating
         await db.commit()
+        invalidate_activity_feed_cache()
         await db.refresh(existing_rating)
         return existing_rating
     
@@ -59,6 +61,7 @@ async def create_rating(
     
     db.add(new_rating)
     await db.commit()
+    invalidate_activity_feed_cache()
     await db.refresh(new_rating)
     
     return new_rating
@@ -92,6 +95,7 @@ async def update_rating(
     rating.rating = rating_update.rating
     
     await db.commit()
+    invalidate_activity_feed_cache()
     await db.refresh(rating)
     
     return rating
@@ -122,6 +126,7 @@ async def delete_rating(
     
     await db.delete(rating)
     await db.commit()
+    invalidate_activity_feed_cache()
     
     return None
 
@@ -13,6 +13,7 @@ from app.database import get_db
 from app.models import Review, User, DJSet, Rating
 from app.schemas import ReviewCreate, ReviewUpdate, ReviewResponse, PaginatedResponse
 from app.auth import get_current_active_user
+from app.core.cache import invalidate_activity_feed_cache
 from app.core.exceptions import DuplicateEntryError
 
 router = APIRouter(prefix="/api/reviews", tags=["reviews"])
@@ -56,6 +57,7 @@ async def create_review(
     
     db.add(new_review)
     await db.commit()
+    invalidate_activity_feed_cache()
     await db.refresh(new_review)
     
     # Load user relationship for response
@@ -210,6 +212,7 @@ async def update_review(
         review.is_public = review_update.is_public
     
     await db.commit()
+    invalidate_activity_feed_cache()
     await db.refresh(review)
     await db.refresh(review, ["user"])
     
@@ -253,6 +256,7 @@ async def delete_review(
     
     await db.delete(review)
     await db.commit()
+    invalidate_activity_feed_cache()
 
     return None
 
@@ -5,8 +5,10 @@ Handles CRUD operations for independent tracks (not tied to specific sets).
 Tracks can be searched on SoundCloud, created, and linked to multiple sets.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import logging
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_, delete
 from uuid import UUID
@@ -22,46 +24,13 @@ from app.schemas import (
     PaginatedResponse,
     DJSetResponse
 )
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_optional_user
 from app.core.exceptions import SetNotFoundError
+from app.services.artists import ensure_artists_from_spotify
+from app.core.cache import invalidate_set_tracks_cache, invalidate_discover_cache, invalidate_activity_feed_cache
 
 router = APIRouter(prefix="/api/tracks", tags=["standalone-tracks"])
 
-security = HTTPBearer(auto_error=False)
-
-
-async def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(security),
-    db: AsyncSession = Depends(get_db)
-) -> Optional[User]:
-    """Optional dependency to get current user if authenticated."""
-    if not credentials:
-        return None
-    try:
-        from app.auth import oauth2_scheme
-        from jose import JWTError, jwt
-        from app.config import settings
-        from sqlalchemy import select
-        
-        # Decode the token
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        
-        # Extract user_id from token
-        user_id: Optional[str] = payload.get("sub")
-        if user_id is None:
-            return None
-        
-        # Fetch user from database
-        result = await db.execute(select(User).where(User.id == UUID(user_id)))
-        user = result.scalar_one_or_none()
-        
-        return user
-    except:
-        return None
 
 
 @router.post("", response_model=TrackResponse, status_code=status.HTTP_201_CREATED)
@@ -129,15 +98,14 @@ async def create_track(
     db.add(new_track)
     await db.commit()
     await db.refresh(new_track)
+    invalidate_discover_cache()
     
     # Auto-create Artist entries from Spotify artist IDs
     if track_data.spotify_artist_ids:
         try:
-            from app.api.artists import ensure_artists_from_spotify
             await ensure_artists_from_spotify(track_data.spotify_artist_ids, db)
             await db.commit()
         except Exception as e:
-            import logging
             logging.getLogger(__name__).warning(f"Failed to auto-create artists: {e}")
     
     track_dict = TrackResponse.model_validate(new_track).model_dump()
@@ -232,7 +200,6 @@ async def get_related_tracks(
     db: AsyncSession = Depends(get_db),
 ):
     """Get other tracks that share any individual artist with this track."""
-    import re
     result = await db.execute(select(Track).where(Track.id == track_id))
     track = result.scalar_one_or_none()
     if not track or not track.artist_name:
@@ -324,6 +291,8 @@ async def link_track_to_set(
     
     db.add(new_link)
     await db.commit()
+    invalidate_set_tracks_cache(link_data.set_id)
+    invalidate_discover_cache()
     await db.refresh(new_link, ["track", "set", "added_by"])
     
     # Convert to response
@@ -371,6 +340,8 @@ async def unlink_track_from_set(
         TrackSetLink.set_id == set_id
     ))
     await db.commit()
+    invalidate_set_tracks_cache(set_id)
+    invalidate_discover_cache()
     
     return None
 
@@ -477,6 +448,7 @@ async def set_top_track(
         db.add(new_top_track)
     
     await db.commit()
+    invalidate_activity_feed_cache()
     
     # Return updated track
     return await get_track(track_id, db, current_user)
@@ -509,5 +481,6 @@ async def unset_top_track(
         UserTopTrack.user_id == current_user.id
     ))
     await db.commit()
+    invalidate_activity_feed_cache()
     
     return None
@@ -7,13 +7,16 @@ Also provides rating statistics.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, delete
+from sqlalchemy.orm import joinedload
 from uuid import UUID
 
 from app.database import get_db
-from app.models import TrackRating, User, Track, TrackReview
+from app.models import TrackRating, User, TrackReview
 from app.schemas import TrackRatingCreate, TrackRatingUpdate, TrackRatingResponse
 from app.auth import get_current_active_user
+from app.core.cache import invalidate_activity_feed_cache
+from app.core.tracks import ensure_track_exists
 from app.core.exceptions import SetNotFoundError
 
 router = APIRouter(prefix="/api/tracks", tags=["track-ratings"])
@@ -27,15 +30,7 @@ async def create_track_rating(
     db: AsyncSession = Depends(get_db)
 ):
     """Rate a track."""
-    # Check if track exists
-    result = await db.execute(select(Track).where(Track.id == track_id))
-    track_obj = result.scalar_one_or_none()
-    
-    if not track_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Track with ID {track_id} not found"
-        )
+    await ensure_track_exists(db, track_id)
     
     # Verify track_id matches
     if rating_data.track_id != track_id:
@@ -44,9 +39,11 @@ async def create_track_rating(
             detail="Track ID in URL does not match track ID in request body"
         )
     
-    # Check if rating already exists
+    # Check if rating already exists (the owner is current_user, so load it alongside)
     existing = await db.execute(
-        select(TrackRating).where(
+        select(TrackRating)
+        .options(joinedload(TrackRating.user))
+        .where(
             TrackRating.user_id == current_user.id,
             TrackRating.track_id == track_id
         )
@@ -57,21 +54,20 @@ async def create_track_rating(
         # Update existing rating
         existing_rating.rating = rating_data.rating
         await db.commit()
-        await db.refresh(existing_rating)
-        await db.refresh(existing_rating, ["user"])
+        invalidate_activity_feed_cache()
         return existing_rating
     
     # Create new rating
     new_rating = TrackRating(
         user_id=current_user.id,
+        user=current_user,
         track_id=track_id,
         rating=rating_data.rating
     )
     
     db.add(new_rating)
     await db.commit()
-    await db.refresh(new_rating)
-    await db.refresh(new_rating, ["user"])
+    invalidate_activity_feed_cache()
     
     return new_rating
 
@@ -86,7 +82,9 @@ async def update_track_rating(
 ):
     """Update a track rating."""
     result = await db.execute(
-        select(TrackRating).where(
+        select(TrackRating)
+        .options(joinedload(TrackRating.user))
+        .where(
             TrackRating.id == rating_id,
             TrackRating.track_id == track_id
         )
@@ -109,8 +107,7 @@ async def update_track_rating(
     # Update rating
     rating_obj.rating = rating_update.rating
     await db.commit()
-    await db.refresh(rating_obj)
-    await db.refresh(rating_obj, ["user"])
+    invalidate_activity_feed_cache()
     
     return rating_obj
 
@@ -123,30 +120,38 @@ async def delete_track_rating(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a track rating."""
+    # Delete in one statement; ownership is enforced in the WHERE clause
     result = await db.execute(
-        select(TrackRating).where(
+        delete(TrackRating)
+        .where(
             TrackRating.id == rating_id,
-            TrackRating.track_id == track_id
+            TrackRating.track_id == track_id,
+            TrackRating.user_id == current_user.id
         )
+        .returning(TrackRating.id)
     )
-    rating_obj = result.scalar_one_or_none()
-    
-    if not rating_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Rating not found"
+    deleted_id = result.scalar_one_or_none()
+    
+    if deleted_id is None:
+        # Nothing deleted - work out whether the rating is missing or owned by someone else
+        existing = await db.execute(
+            select(TrackRating.id).where(
+                TrackRating.id == rating_id,
+                TrackRating.track_id == track_id
+            )
         )
-    
-    # Check ownership
-    if rating_obj.user_id != current_user.id:
+        if existing.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Rating not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to delete this rating"
         )
     
-    from sqlalchemy import delete
-    await db.execute(delete(TrackRating).where(TrackRating.id == rating_id))
     await db.commit()
+    invalidate_activity_feed_cache()
     
     return None
 
@@ -157,15 +162,7 @@ async def get_track_rating_stats(
     db: AsyncSession = Depends(get_db)
 ):
     """Get rating statistics for a track."""
-    # Check if track exists
-    result = await db.execute(select(Track).where(Track.id == track_id))
-    track_obj = result.scalar_one_or_none()
-    
-    if not track_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Track with ID {track_id} not found"
-        )
+    await ensure_track_exists(db, track_id)
     
     # Calculate average rating
     avg_result = await db.execute(
@@ -6,18 +6,29 @@ Handles creating, reading, updating, and deleting reviews for tracks.
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, delete, and_
+from sqlalchemy.orm import joinedload
+from typing import Optional
 from uuid import UUID
 
 from app.database import get_db
-from app.models import TrackReview, User, Track, TrackRating
+from app.models import TrackReview, User, TrackRating
 from app.schemas import TrackReviewCreate, TrackReviewUpdate, TrackReviewResponse, PaginatedResponse
 from app.auth import get_current_active_user
+from app.core.cache import invalidate_activity_feed_cache
+from app.core.tracks import ensure_track_exists
 from app.core.exceptions import DuplicateEntryError
 
 router = APIRouter(prefix="/api/tracks", tags=["track-reviews"])
 
 
+def _review_response(review: TrackReview, user_rating: Optional[float]) -> TrackReviewResponse:
+    """Build the response for a review (with its user loaded) in a single validation pass."""
+    response = TrackReviewResponse.model_validate(review)
+    response.user_rating = user_rating
+    return response
+
+
 @router.post("/{track_id}/reviews", response_model=TrackReviewResponse, status_code=status.HTTP_201_CREATED)
 async def create_track_review(
     track_id: UUID,
@@ -26,15 +37,7 @@ async def create_track_review(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a review for a track."""
-    # Check if track exists
-    result = await db.execute(select(Track).where(Track.id == track_id))
-    track_obj = result.scalar_one_or_none()
-    
-    if not track_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Track with ID {track_id} not found"
-        )
+    await ensure_track_exists(db, track_id)
     
     # Verify track_id matches
     if review_data.track_id != track_id:
@@ -56,6 +59,7 @@ async def create_track_review(
     # Create review
     new_review = TrackReview(
         user_id=current_user.id,
+        user=current_user,
         track_id=track_id,
         content=review_data.content,
         contains_spoilers=review_data.contains_spoilers,
@@ -64,24 +68,18 @@ async def create_track_review(
     
     db.add(new_review)
     await db.commit()
-    await db.refresh(new_review)
-    await db.refresh(new_review, ["user"])
+    invalidate_activity_feed_cache()
     
     # Get the user's rating for this track
     rating_result = await db.execute(
-        select(TrackRating).where(
+        select(TrackRating.rating).where(
             TrackRating.user_id == current_user.id,
             TrackRating.track_id == track_id
         )
     )
-    user_rating_obj = rating_result.scalar_one_or_none()
-    
-    # Convert to response schema
-    review_dict = TrackReviewResponse.model_validate(new_review).model_dump()
-    if user_rating_obj:
-        review_dict['user_rating'] = user_rating_obj.rating
+    user_rating = rating_result.scalar_one_or_none()
     
-    return TrackReviewResponse(**review_dict)
+    return _review_response(new_review, user_rating)
 
 
 @router.get("/{track_id}/reviews", response_model=PaginatedResponse)
@@ -92,55 +90,45 @@ async def get_track_reviews(
     db: AsyncSession = Depends(get_db)
 ):
     """Get reviews for a track."""
-    # Check if track exists
-    result = await db.execute(select(Track).where(Track.id == track_id))
-    track_obj = result.scalar_one_or_none()
+    await ensure_track_exists(db, track_id)
     
-    if not track_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Track with ID {track_id} not found"
+    # Page of public reviews with each author and their rating for this track.
+    # COUNT(*) OVER () returns the total alongside the page from the same scan;
+    # the unique (user_id, track_id) rating constraint means the join cannot add rows.
+    public_filter = (TrackReview.track_id == track_id, TrackReview.is_public == True)
+    offset = (page - 1) * limit
+    result = await db.execute(
+        select(TrackReview, TrackRating.rating, func.count().over().label("total"))
+        .options(joinedload(TrackReview.user))
+        .outerjoin(
+            TrackRating,
+            and_(
+                TrackRating.user_id == TrackReview.user_id,
+                TrackRating.track_id == TrackReview.track_id
+            )
         )
-    
-    # Build query - only public reviews
-    query = (
-        select(TrackReview)
-        .where(TrackReview.track_id == track_id, TrackReview.is_public == True)
+        .where(*public_filter)
         .order_by(TrackReview.created_at.desc())
+        .offset(offset)
+        .limit(limit)
     )
-    
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-    
-    # Apply pagination
-    offset = (page - 1) * limit
-    query = query.offset(offset).limit(limit)
-    
-    # Execute query
-    result = await db.execute(query)
-    reviews = result.scalars().all()
-    
-    # Load user relationships and get ratings
-    review_responses = []
-    for review in reviews:
-        await db.refresh(review, ["user"])
-        
-        # Get user's rating for this track
-        rating_result = await db.execute(
-            select(TrackRating).where(
-                TrackRating.user_id == review.user_id,
-                TrackRating.track_id == track_id
-            )
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        # Past the last page there are no rows to carry the window total
+        count_result = await db.execute(
+            select(func.count(TrackReview.id)).where(*public_filter)
         )
-        user_rating_obj = rating_result.scalar_one_or_none()
-        
-        review_dict = TrackReviewResponse.model_validate(review).model_dump()
-        if user_rating_obj:
-            review_dict['user_rating'] = user_rating_obj.rating
-        
-        review_responses.append(TrackReviewResponse(**review_dict))
+        total = count_result.scalar() or 0
+    else:
+        total = 0
+    
+    review_responses = [
+        _review_response(review, user_rating)
+        for review, user_rating, _ in rows
+    ]
     
     # Calculate pages
     pages = (total + limit - 1) // limit if total > 0 else 0
@@ -163,20 +151,32 @@ async def update_track_review(
     db: AsyncSession = Depends(get_db)
 ):
     """Update a track review."""
+    # Load the review, its author and the author's rating for the track in one query
     result = await db.execute(
-        select(TrackReview).where(
+        select(TrackReview, TrackRating.rating)
+        .options(joinedload(TrackReview.user))
+        .outerjoin(
+            TrackRating,
+            and_(
+                TrackRating.user_id == TrackReview.user_id,
+                TrackRating.track_id == TrackReview.track_id
+            )
+        )
+        .where(
             TrackReview.id == review_id,
             TrackReview.track_id == track_id
         )
     )
-    review_obj = result.scalar_one_or_none()
+    row = result.first()
     
-    if not review_obj:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Review not found"
         )
     
+    review_obj, user_rating = row
+    
     # Check ownership
     if review_obj.user_id != current_user.id:
         raise HTTPException(
@@ -193,23 +193,9 @@ async def update_track_review(
         review_obj.is_public = review_update.is_public
     
     await db.commit()
-    await db.refresh(review_obj)
-    await db.refresh(review_obj, ["user"])
-    
-    # Get user's rating
-    rating_result = await db.execute(
-        select(TrackRating).where(
-            TrackRating.user_id == current_user.id,
-            TrackRating.track_id == track_id
-        )
-    )
-    user_rating_obj = rating_result.scalar_one_or_none()
+    invalidate_activity_feed_cache()
     
-    review_dict = TrackReviewResponse.model_validate(review_obj).model_dump()
-    if user_rating_obj:
-        review_dict['user_rating'] = user_rating_obj.rating
-    
-    return TrackReviewResponse(**review_dict)
+    return _review_response(review_obj, user_rating)
 
 
 @router.delete("/{track_id}/reviews/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -220,29 +206,37 @@ async def delete_track_review(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a track review."""
+    # Delete in one statement; ownership is enforced in the WHERE clause
     result = await db.execute(
-        select(TrackReview).where(
+        delete(TrackReview)
+        .where(
             TrackReview.id == review_id,
-            TrackReview.track_id == track_id
+            TrackReview.track_id == track_id,
+            TrackReview.user_id == current_user.id
         )
+        .returning(TrackReview.id)
     )
-    review_obj = result.scalar_one_or_none()
-    
-    if not review_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Review not found"
+    deleted_id = result.scalar_one_or_none()
+    
+    if deleted_id is None:
+        # Nothing deleted - work out whether the review is missing or owned by someone else
+        existing = await db.execute(
+            select(TrackReview.id).where(
+                TrackReview.id == review_id,
+                TrackReview.track_id == track_id
+            )
         )
-    
-    # Check ownership
-    if review_obj.user_id != current_user.id:
+        if existing.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Review not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to delete this review"
         )
     
-    from sqlalchemy import delete
-    await db.execute(delete(TrackReview).where(TrackReview.id == review_id))
     await db.commit()
+    invalidate_activity_feed_cache()
     
     return None
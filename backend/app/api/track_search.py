@@ -4,11 +4,14 @@ Track search API routes.
 Handles searching for tracks on SoundCloud and creating tracks from search results.
 """
 
-from fastapi import APIRouter, Depends, Query, Security, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, or_, func, bindparam, column, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from uuid import UUID
 
 from app.database import get_db
@@ -16,44 +19,136 @@ from app.models import Track, User
 from app.schemas import TrackCreate, TrackResponse
 from app.services import soundcloud_search
 from app.services import spotify_search
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_optional_user
 
 router = APIRouter(prefix="/api/tracks", tags=["tracks"])
 
-security = HTTPBearer(auto_error=False)
 
+# Cache for upstream search/resolve payloads: key -> (payload, expires_at)
+_upstream_cache: Dict[tuple, tuple[Any, datetime]] = {}
+_UPSTREAM_CACHE_MAX_ENTRIES = 1000
+SEARCH_CACHE_TTL = timedelta(minutes=5)
+RESOLVE_CACHE_TTL = timedelta(hours=1)
 
-async def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(security),
-    db: AsyncSession = Depends(get_db)
-) -> Optional[User]:
-    """Optional dependency to get current user if authenticated."""
-    if not credentials:
-        return None
-    try:
-        from app.auth import oauth2_scheme
-        from jose import JWTError, jwt
-        from app.config import settings
-        
-        # Decode the token
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        
-        # Extract user_id from token
-        user_id: Optional[str] = payload.get("sub")
-        if user_id is None:
-            return None
-        
-        # Fetch user from database
-        result = await db.execute(select(User).where(User.id == UUID(user_id)))
-        user = result.scalar_one_or_none()
-        
-        return user
-    except:
-        return None
+
+async def _cached_upstream(
+    key: tuple,
+    ttl: timedelta,
+    fetch: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Return an upstream API payload, fetching it only if not cached.
+    
+    Only the raw platform payload is cached; database-dependent fields such
+    as exists_in_db are added by the caller on a copy. Empty results are not
+    cached so transient upstream failures are retried on the next request.
+    """
+    cached = _upstream_cache.get(key)
+    if cached and datetime.utcnow() < cached[1]:
+        payload = cached[0]
+    else:
+        payload = await fetch()
+        if payload:
+            if len(_upstream_cache) >= _UPSTREAM_CACHE_MAX_ENTRIES:
+                now = datetime.utcnow()
+                for stale_key in [k for k, (_, exp) in _upstream_cache.items() if exp <= now]:
+                    del _upstream_cache[stale_key]
+                if len(_upstream_cache) >= _UPSTREAM_CACHE_MAX_ENTRIES:
+                    # Drop the oldest entry (dicts keep insertion order)
+                    del _upstream_cache[next(iter(_upstream_cache))]
+            _upstream_cache[key] = (payload, datetime.utcnow() + ttl)
+    
+    # Hand out copies so per-request fields never leak into the cache
+    if isinstance(payload, list):
+        return [dict(item) for item in payload]
+    return dict(payload) if payload else payload
+
+
+def _search_soundcloud_cached(query: str, limit: int) -> Awaitable[List[dict]]:
+    """Search SoundCloud, reusing recent results for the same query."""
+    return _cached_upstream(
+        ("soundcloud", "search", query.strip().lower(), limit),
+        SEARCH_CACHE_TTL,
+        lambda: soundcloud_search.search_soundcloud_tracks(query, limit)
+    )
+
+
+def _search_spotify_cached(query: str, limit: int) -> Awaitable[List[dict]]:
+    """Search Spotify, reusing recent results for the same query."""
+    return _cached_upstream(
+        ("spotify", "search", query.strip().lower(), limit),
+        SEARCH_CACHE_TTL,
+        lambda: spotify_search.search_spotify_tracks(query, limit)
+    )
+
+
+async def _no_results() -> List[dict]:
+    """Placeholder awaitable for a platform that is not being searched."""
+    return []
+
+
+async def _match_existing_tracks(db: AsyncSession, results: List[dict]) -> Dict[int, UUID]:
+    """
+    Find tracks already in the database for a list of platform search results.
+    
+    The results' platform URLs and IDs are sent as a probe table joined against
+    tracks, so every result is matched in a single query. Each probe row only
+    fills the columns for its own platform, so SoundCloud and Spotify values can
+    never match each other. A URL match wins over an ID match.
+    
+    Returns:
+        Mapping of result index to the matching track's ID
+    """
+    probe_rows = []
+    for index, result in enumerate(results):
+        ext_id = str(result['id']) if result.get('id') else None
+        if result.get('platform') == 'soundcloud':
+            row = (index, result.get('soundcloud_url'), ext_id, None, None)
+        elif result.get('platform') == 'spotify':
+            row = (index, None, None, result.get('spotify_url'), ext_id)
+        else:
+            continue
+        if any(value is not None for value in row[1:]):
+            probe_rows.append(row)
+    
+    if not probe_rows:
+        return {}
+    
+    # unnest() over one array per column keeps the SQL text identical for any
+    # number of results, so a single prepared statement and plan is reused
+    idxs, soundcloud_urls, soundcloud_ids, spotify_urls, spotify_ids = map(list, zip(*probe_rows))
+    probe = func.unnest(
+        bindparam('idx', idxs, type_=ARRAY(Integer)),
+        bindparam('soundcloud_url', soundcloud_urls, type_=ARRAY(String)),
+        bindparam('soundcloud_id', soundcloud_ids, type_=ARRAY(String)),
+        bindparam('spotify_url', spotify_urls, type_=ARRAY(String)),
+        bindparam('spotify_id', spotify_ids, type_=ARRAY(String)),
+    ).table_valued(
+        column('idx', Integer),
+        column('soundcloud_url', String),
+        column('soundcloud_id', String),
+        column('spotify_url', String),
+        column('spotify_id', String),
+    ).render_derived(name='probe')
+    
+    url_match = or_(
+        Track.soundcloud_url == probe.c.soundcloud_url,
+        Track.spotify_url == probe.c.spotify_url
+    )
+    id_match = or_(
+        Track.soundcloud_track_id == probe.c.soundcloud_id,
+        Track.spotify_track_id == probe.c.spotify_id
+    )
+    result = await db.execute(
+        select(probe.c.idx, Track.id)
+        .select_from(probe.join(Track, or_(url_match, id_match)))
+        .order_by(probe.c.idx, func.coalesce(url_match, False).desc())
+    )
+    
+    matches: Dict[int, UUID] = {}
+    for index, track_id in result:
+        matches.setdefault(index, track_id)
+    return matches
 
 
 @router.get("/search/soundcloud", response_model=List[dict])
@@ -70,44 +165,20 @@ async def search_soundcloud(
     Returns track information including title, artist, SoundCloud URL, and metadata.
     Also checks if tracks already exist in the database.
     """
-    results = await soundcloud_search.search_soundcloud_tracks(query, limit)
+    results = await _search_soundcloud_cached(query, limit)
+    if not results:
+        return []
+    
+    for result in results:
+        result['platform'] = 'soundcloud'
     
     # Check which tracks already exist in database
-    if results:
-        soundcloud_urls = [r.get('soundcloud_url') for r in results if r.get('soundcloud_url')]
-        soundcloud_ids = [r.get('id') for r in results if r.get('id')]
-        
-        existing_tracks = []
-        if soundcloud_urls:
-            existing_by_url = await db.execute(
-                select(Track).where(Track.soundcloud_url.in_(soundcloud_urls))
-            )
-            existing_tracks.extend(existing_by_url.scalars().all())
-        
-        if soundcloud_ids:
-            existing_by_id = await db.execute(
-                select(Track).where(Track.soundcloud_track_id.in_([str(sid) for sid in soundcloud_ids]))
-            )
-            existing_tracks.extend(existing_by_id.scalars().all())
-        
-        # Create a set of existing SoundCloud URLs and IDs
-        existing_urls = {t.soundcloud_url for t in existing_tracks if t.soundcloud_url}
-        existing_ids = {t.soundcloud_track_id for t in existing_tracks if t.soundcloud_track_id}
-        
-        # Add existence flag and platform to results
-        for result in results:
-            result['platform'] = 'soundcloud'
-            result['exists_in_db'] = (
-                result.get('soundcloud_url') in existing_urls or
-                str(result.get('id')) in existing_ids
-            )
-            # If exists, add the track ID
-            if result['exists_in_db']:
-                for track in existing_tracks:
-                    if (track.soundcloud_url == result.get('soundcloud_url') or
-                        track.soundcloud_track_id == str(result.get('id'))):
-                        result['track_id'] = str(track.id)
-                        break
+    matches = await _match_existing_tracks(db, results)
+    for index, result in enumerate(results):
+        result['exists_in_db'] = index in matches
+        # If exists, add the track ID
+        if index in matches:
+            result['track_id'] = str(matches[index])
     
     return results
 
@@ -126,44 +197,20 @@ async def search_spotify(
     Returns track information including title, artist, Spotify URL, and metadata.
     Also checks if tracks already exist in the database.
     """
-    results = await spotify_search.search_spotify_tracks(query, limit)
+    results = await _search_spotify_cached(query, limit)
+    if not results:
+        return []
+    
+    for result in results:
+        result['platform'] = 'spotify'
     
     # Check which tracks already exist in database
-    if results:
-        spotify_urls = [r.get('spotify_url') for r in results if r.get('spotify_url')]
-        spotify_ids = [r.get('id') for r in results if r.get('id')]
-        
-        existing_tracks = []
-        if spotify_urls:
-            existing_by_url = await db.execute(
-                select(Track).where(Track.spotify_url.in_(spotify_urls))
-            )
-            existing_tracks.extend(existing_by_url.scalars().all())
-        
-        if spotify_ids:
-            existing_by_id = await db.execute(
-                select(Track).where(Track.spotify_track_id.in_(spotify_ids))
-            )
-            existing_tracks.extend(existing_by_id.scalars().all())
-        
-        # Create a set of existing Spotify URLs and IDs
-        existing_urls = {t.spotify_url for t in existing_tracks if t.spotify_url}
-        existing_ids = {t.spotify_track_id for t in existing_tracks if t.spotify_track_id}
-        
-        # Add existence flag and platform to results
-        for result in results:
-            result['platform'] = 'spotify'
-            result['exists_in_db'] = (
-                result.get('spotify_url') in existing_urls or
-                result.get('id') in existing_ids
-            )
-            # If exists, add the track ID
-            if result['exists_in_db']:
-                for track in existing_tracks:
-                    if (track.spotify_url == result.get('spotify_url') or
-                        track.spotify_track_id == result.get('id')):
-                        result['track_id'] = str(track.id)
-                        break
+    matches = await _match_existing_tracks(db, results)
+    for index, result in enumerate(results):
+        result['exists_in_db'] = index in matches
+        # If exists, add the track ID
+        if index in matches:
+            result['track_id'] = str(matches[index])
     
     return results
 
@@ -184,81 +231,31 @@ async def search_tracks(
     """
     all_results = []
     
-    if platform in ("all", "soundcloud"):
-        soundcloud_results = await soundcloud_search.search_soundcloud_tracks(query, limit)
-        for result in soundcloud_results:
-            result['platform'] = 'soundcloud'
-        all_results.extend(soundcloud_results)
+    # Query both platforms concurrently - they are independent HTTP calls
+    soundcloud_results, spotify_results = await asyncio.gather(
+        _search_soundcloud_cached(query, limit)
+        if platform in ("all", "soundcloud") else _no_results(),
+        _search_spotify_cached(query, limit)
+        if platform in ("all", "spotify") else _no_results(),
+    )
     
-    if platform in ("all", "spotify"):
-        spotify_results = await spotify_search.search_spotify_tracks(query, limit)
-        for result in spotify_results:
-            result['platform'] = 'spotify'
-        all_results.extend(spotify_results)
+    for result in soundcloud_results:
+        result['platform'] = 'soundcloud'
+    all_results.extend(soundcloud_results)
+    
+    for result in spotify_results:
+        result['platform'] = 'spotify'
+    all_results.extend(spotify_results)
+    
+    if not all_results:
+        return []
     
     # Check which tracks already exist in database
-    if all_results:
-        # Collect all URLs and IDs
-        soundcloud_urls = [r.get('soundcloud_url') for r in all_results if r.get('soundcloud_url')]
-        soundcloud_ids = [str(r.get('id')) for r in all_results if r.get('platform') == 'soundcloud' and r.get('id')]
-        spotify_urls = [r.get('spotify_url') for r in all_results if r.get('spotify_url')]
-        spotify_ids = [r.get('id') for r in all_results if r.get('platform') == 'spotify' and r.get('id')]
-        
-        existing_tracks = []
-        if soundcloud_urls:
-            existing_by_url = await db.execute(
-                select(Track).where(Track.soundcloud_url.in_(soundcloud_urls))
-            )
-            existing_tracks.extend(existing_by_url.scalars().all())
-        
-        if soundcloud_ids:
-            existing_by_id = await db.execute(
-                select(Track).where(Track.soundcloud_track_id.in_(soundcloud_ids))
-            )
-            existing_tracks.extend(existing_by_id.scalars().all())
-        
-        if spotify_urls:
-            existing_by_url = await db.execute(
-                select(Track).where(Track.spotify_url.in_(spotify_urls))
-            )
-            existing_tracks.extend(existing_by_url.scalars().all())
-        
-        if spotify_ids:
-            existing_by_id = await db.execute(
-                select(Track).where(Track.spotify_track_id.in_(spotify_ids))
-            )
-            existing_tracks.extend(existing_by_id.scalars().all())
-        
-        # Create sets of existing URLs and IDs
-        existing_soundcloud_urls = {t.soundcloud_url for t in existing_tracks if t.soundcloud_url}
-        existing_soundcloud_ids = {t.soundcloud_track_id for t in existing_tracks if t.soundcloud_track_id}
-        existing_spotify_urls = {t.spotify_url for t in existing_tracks if t.spotify_url}
-        existing_spotify_ids = {t.spotify_track_id for t in existing_tracks if t.spotify_track_id}
-        
-        # Add existence flags to results
-        for result in all_results:
-            if result.get('platform') == 'soundcloud':
-                result['exists_in_db'] = (
-                    result.get('soundcloud_url') in existing_soundcloud_urls or
-                    str(result.get('id')) in existing_soundcloud_ids
-                )
-                if result['exists_in_db']:
-                    for track in existing_tracks:
-                        if (track.soundcloud_url == result.get('soundcloud_url') or
-                            track.soundcloud_track_id == str(result.get('id'))):
-                            result['track_id'] = str(track.id)
-                            break
-            elif result.get('platform') == 'spotify':
-                result['exists_in_db'] = (
-                    result.get('spotify_url') in existing_spotify_urls or
-                    result.get('id') in existing_spotify_ids
-                )
-                if result['exists_in_db']:
-                    for track in existing_tracks:
-                        if (track.spotify_url == result.get('spotify_url') or
-                            track.spotify_track_id == result.get('id')):
-                            result['track_id'] = str(track.id)
-                            break
+    matches = await _match_existing_tracks(db, all_results)
+    for index, result in enumerate(all_results):
+        result['exists_in_db'] = index in matches
+        if index in matches:
+            result['track_id'] = str(matches[index])
     
     return all_results
 
@@ -287,7 +284,11 @@ async def resolve_track_url(
     track_info = None
     
     if is_soundcloud:
-        track_info = await soundcloud_search.resolve_soundcloud_url(url)
+        track_info = await _cached_upstream(
+            ("soundcloud", "resolve", url.strip()),
+            RESOLVE_CACHE_TTL,
+            lambda: soundcloud_search.resolve_soundcloud_url(url)
+        )
         if track_info:
             kind = track_info.get('kind', 'track')
             if kind in ('playlist',):
@@ -301,7 +302,11 @@ async def resolve_track_url(
                 track_info['_warning'] = 'This looks like a DJ set/mix (over 20 minutes). Consider importing it as a set instead.'
             track_info['platform'] = 'soundcloud'
     elif is_spotify:
-        track_info = await spotify_search.resolve_spotify_url(url)
+        track_info = await _cached_upstream(
+            ("spotify", "resolve", url.strip()),
+            RESOLVE_CACHE_TTL,
+            lambda: spotify_search.resolve_spotify_url(url)
+        )
         if track_info:
             track_info['platform'] = 'spotify'
     
@@ -315,43 +320,28 @@ async def resolve_track_url(
     track_info['exists_in_db'] = False
     track_info['track_id'] = None
     
+    # Match on URL or platform ID in a single query, preferring a URL match
+    conditions = []
     if is_soundcloud:
-        if track_info.get('soundcloud_url'):
-            existing = await db.execute(
-                select(Track).where(Track.soundcloud_url == track_info['soundcloud_url'])
-            )
-            existing_track = existing.scalar_one_or_none()
-            if existing_track:
-                track_info['exists_in_db'] = True
-                track_info['track_id'] = str(existing_track.id)
-        
-        if not track_info['exists_in_db'] and track_info.get('id'):
-            existing = await db.execute(
-                select(Track).where(Track.soundcloud_track_id == str(track_info['id']))
-            )
-            existing_track = existing.scalar_one_or_none()
-            if existing_track:
-                track_info['exists_in_db'] = True
-                track_info['track_id'] = str(existing_track.id)
+        url_column, id_column = Track.soundcloud_url, Track.soundcloud_track_id
+        track_url = track_info.get('soundcloud_url')
+    else:
+        url_column, id_column = Track.spotify_url, Track.spotify_track_id
+        track_url = track_info.get('spotify_url')
     
-    elif is_spotify:
-        if track_info.get('spotify_url'):
-            existing = await db.execute(
-                select(Track).where(Track.spotify_url == track_info['spotify_url'])
-            )
-            existing_track = existing.scalar_one_or_none()
-            if existing_track:
-                track_info['exists_in_db'] = True
-                track_info['track_id'] = str(existing_track.id)
-        
-        if not track_info['exists_in_db'] and track_info.get('id'):
-            existing = await db.execute(
-                select(Track).where(Track.spotify_track_id == track_info['id'])
-            )
-            existing_track = existing.scalar_one_or_none()
-            if existing_track:
-                track_info['exists_in_db'] = True
-                track_info['track_id'] = str(existing_track.id)
+    if track_url:
+        conditions.append(url_column == track_url)
+    if track_info.get('id'):
+        conditions.append(id_column == str(track_info['id']))
+    
+    if conditions:
+        query = select(Track.id).where(or_(*conditions)).limit(1)
+        if track_url:
+            query = query.order_by(func.coalesce(url_column == track_url, False).desc())
+        existing_track_id = (await db.execute(query)).scalar_one_or_none()
+        if existing_track_id:
+            track_info['exists_in_db'] = True
+            track_info['track_id'] = str(existing_track_id)
     
     return track_info
 
@@ -4,71 +4,172 @@ Track tags API routes.
 Handles adding, removing, and searching for track tags on sets.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete, or_
-from uuid import UUID
-from typing import Optional, List, Union
-
-from app.database import get_db
-from app.models import SetTrack, DJSet, User, TrackConfirmation, TrackRating, Track, TrackSetLink
-from sqlalchemy import or_
-from sqlalchemy.orm import aliased
+from sqlalchemy import (
+    select, func, delete, update, or_, null, true, false, cast, union_all, literal_column,
+    lambda_stmt, bindparam, literal, tuple_, Boolean, Integer
+)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
+from uuid import UUID, uuid4
+import base64
+from typing import Optional, List, Dict
+from datetime import datetime, timedelta
+
+from app.database import get_db, AsyncSessionLocal
+from app.models import SetTrack, DJSet, User, TrackConfirmation, TrackRating, Track, TrackSetLink, UserTopTrack
 from app.schemas import (
     SetTrackCreate,
     SetTrackUpdate,
     SetTrackResponse,
-    PaginatedResponse,
+    CursorPaginatedResponse,
     TrackConfirmationCreate,
     TrackConfirmationResponse,
-    TrackResponse
+    TrackResponse,
+    UserResponse
 )
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_optional_user
 from app.core.exceptions import SetNotFoundError
+from app.core.cache import (
+    set_tracks_cache, SET_TRACKS_CACHE_MAX_ENTRIES, SET_TRACKS_CACHE_TTL,
+    discover_cache, DISCOVER_CACHE_MAX_ENTRIES, DISCOVER_CACHE_TTL,
+    invalidate_set_tracks_cache, invalidate_discover_cache,
+)
+from app.core.tracks import TRACK_RESPONSE_COLUMNS
 from app.services import soundcloud_search as soundcloud_search_service
-from sqlalchemy import func, case
 
-security = HTTPBearer(auto_error=False)
 
-router = APIRouter(prefix="/api/sets/{set_id}/tracks", tags=["tracks"])
+# Track lists are large nested payloads, so render them with orjson
+router = APIRouter(prefix="/api/sets/{set_id}/tracks", tags=["tracks"], default_response_class=ORJSONResponse)
 
 # Separate router for track discovery (without set_id in path)
-discover_router = APIRouter(prefix="/api/tracks", tags=["tracks"])
+discover_router = APIRouter(prefix="/api/tracks", tags=["tracks"], default_response_class=ORJSONResponse)
 
+# Cache for resolved SoundCloud track IDs: url -> (soundcloud_track_id, expires_at)
+_soundcloud_id_cache: Dict[str, tuple[str, datetime]] = {}
+_SOUNDCLOUD_ID_CACHE_MAX_ENTRIES = 5000
+SOUNDCLOUD_ID_CACHE_TTL = timedelta(hours=24)
 
-async def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(security),
-    db: AsyncSession = Depends(get_db)
-) -> Optional[User]:
-    """Optional dependency to get current user if authenticated."""
-    if not credentials:
-        return None
+
+def _get_cached_soundcloud_track_id(soundcloud_url: str) -> Optional[str]:
+    """Return the cached SoundCloud track ID for a URL, if still fresh."""
+    cached = _soundcloud_id_cache.get(soundcloud_url)
+    if cached and datetime.utcnow() < cached[1]:
+        return cached[0]
+    return None
+
+
+def _encode_discover_cursor(created_at: datetime, track_id: UUID) -> str:
+    """Encode the keyset position after a track as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{track_id}".encode()).decode()
+
+
+def _decode_discover_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a discover cursor. Raises ValueError if it is malformed."""
     try:
-        from app.auth import oauth2_scheme
-        from jose import JWTError, jwt
-        from app.config import settings
-        from sqlalchemy import select
-        
-        # Decode the token
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM]
+        created_at, track_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    except (ValueError, UnicodeError):
+        raise ValueError("Malformed cursor")
+    return datetime.fromisoformat(created_at), UUID(track_id)
+
+
+# User columns selected alongside set track rows to build their added_by
+_ADDED_BY_FIELDS = ('id', 'username', 'email', 'display_name', 'bio', 'avatar_url', 'created_at', 'updated_at')
+
+
+def _added_by_columns() -> list:
+    """Select the adding user's response fields, prefixed with ``added_by_user_``."""
+    return [getattr(User, field).label(f'added_by_user_{field}') for field in _ADDED_BY_FIELDS]
+
+
+def _confirmation_stats(on_clause, current_user: Optional[User], name: str):
+    """
+    Build a LATERAL aggregate of confirmation stats for one tag.
+    
+    Counts confirmations and denials, and the current user's own confirmation
+    (always NULL for anonymous requests).
+    """
+    return (
+        select(
+            func.count().filter(TrackConfirmation.is_confirmed == True).label('confirmation_count'),
+            func.count().filter(TrackConfirmation.is_confirmed == False).label('denial_count'),
+            (
+                func.bool_or(TrackConfirmation.is_confirmed).filter(TrackConfirmation.user_id == current_user.id)
+                if current_user else cast(null(), Boolean)
+            ).label('user_confirmation')
+        )
+        .where(on_clause)
+        .lateral(name)
+    )
+
+
+def _rating_stats(track_id_column, name: str):
+    """Build a LATERAL aggregate of average rating and rating count for one track."""
+    return (
+        select(
+            func.avg(TrackRating.rating).label('average_rating'),
+            func.count(TrackRating.id).label('rating_count')
         )
-        
-        # Extract user_id from token
-        user_id: Optional[str] = payload.get("sub")
-        if user_id is None:
-            return None
-        
-        # Fetch user from database
-        result = await db.execute(select(User).where(User.id == UUID(user_id)))
-        user = result.scalar_one_or_none()
-        
-        return user
-    except:
-        return None
+        .where(TrackRating.track_id == track_id_column)
+        .lateral(name)
+    )
+
+
+def _set_track_in_set_stmt(track_id: UUID, set_id: UUID):
+    """
+    Build the lookup for a SetTrack within a set.
+    
+    Uses a lambda statement so the compiled SQL is cached across requests
+    and only the bound IDs change.
+    """
+    return lambda_stmt(lambda: select(SetTrack)).add_criteria(
+        lambda s: s.where(SetTrack.id == track_id, SetTrack.set_id == set_id)
+    )
+
+
+def _delete_own_set_track_stmt(track_id: UUID, set_id: UUID, user_id: UUID):
+    """Build the cached owner-guarded DELETE for a SetTrack, returning its ID."""
+    return lambda_stmt(lambda: delete(SetTrack).returning(SetTrack.id)).add_criteria(
+        lambda s: s.where(
+            SetTrack.id == track_id,
+            SetTrack.set_id == set_id,
+            SetTrack.added_by_id == user_id
+        )
+    )
+
+
+async def _resolve_set_track_soundcloud_id(set_track_id: UUID, soundcloud_url: str) -> None:
+    """
+    Resolve a SoundCloud URL and store its track ID on a SetTrack.
+    
+    Runs as a background task after the response is sent, so the external
+    SoundCloud request is not on the write path. The update only applies if
+    the SetTrack still has the same URL.
+    """
+    track_info = await soundcloud_search_service.resolve_soundcloud_url(soundcloud_url)
+    if not track_info:
+        return
+    
+    soundcloud_track_id = str(track_info.get("id"))
+    # A URL always resolves to the same track, so remember it for later tags
+    if len(_soundcloud_id_cache) >= _SOUNDCLOUD_ID_CACHE_MAX_ENTRIES:
+        _soundcloud_id_cache.clear()
+    _soundcloud_id_cache[soundcloud_url] = (soundcloud_track_id, datetime.utcnow() + SOUNDCLOUD_ID_CACHE_TTL)
+    
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            update(SetTrack)
+            .where(SetTrack.id == set_track_id, SetTrack.soundcloud_url == soundcloud_url)
+            .values(soundcloud_track_id=soundcloud_track_id)
+            .returning(SetTrack.set_id)
+        )
+        set_id = result.scalar_one_or_none()
+        await session.commit()
+    
+    if set_id is not None:
+        invalidate_set_tracks_cache(set_id)
 
 
 @router.get("", response_model=List[SetTrackResponse])
@@ -78,194 +179,125 @@ async def get_set_tracks(
     current_user: Optional[User] = Depends(get_optional_user)
 ):
     """Get all track tags for a set (both SetTrack and TrackSetLink entries)."""
-    # Check if set exists
-    result = await db.execute(select(DJSet).where(DJSet.id == set_id))
-    set_obj = result.scalar_one_or_none()
-    
-    if not set_obj:
-        raise SetNotFoundError(str(set_id))
-    
-    # Get all SetTrack entries for this set with confirmation counts and rating stats
+    # Anonymous readers all get the same list, so serve it from the cache
+    if current_user is None:
+        cached = set_tracks_cache.get(set_id)
+        if cached and datetime.utcnow() < cached[1]:
+            return list(cached[0])
+    
+    # SetTrack and TrackSetLink entries come back from one UNION ALL with the
+    # same columns, each side carrying its confirmation and rating stats from
+    # per-row LATERAL aggregates (no GROUP BY over joined rows, so confirmations
+    # and ratings cannot fan out) and the adding user's columns.
+    set_track_confirmations = _confirmation_stats(
+        TrackConfirmation.track_id == SetTrack.id, current_user, 'set_track_confirmations'
+    )
+    set_track_ratings = _rating_stats(SetTrack.id, 'set_track_ratings')
     set_tracks_query = (
         select(
-            SetTrack,
-            func.sum(case((TrackConfirmation.is_confirmed == True, 1), else_=0)).label('confirmation_count'),
-            func.sum(case((TrackConfirmation.is_confirmed == False, 1), else_=0)).label('denial_count'),
-            func.avg(TrackRating.rating).label('average_rating'),
-            func.count(TrackRating.id).label('rating_count')
-        )
-        .outerjoin(TrackConfirmation, SetTrack.id == TrackConfirmation.track_id)
-        .outerjoin(TrackRating, SetTrack.id == TrackRating.track_id)
+            SetTrack.id,
+            SetTrack.set_id,
+            SetTrack.added_by_id,
+            SetTrack.track_name,
+            SetTrack.artist_name,
+            SetTrack.soundcloud_url,
+            SetTrack.soundcloud_track_id,
+            SetTrack.position,
+            SetTrack.timestamp_minutes,
+            SetTrack.is_top_track,
+            SetTrack.top_track_order,
+            SetTrack.created_at,
+            cast(null(), PG_UUID(as_uuid=True)).label('track_entity_id'),
+            set_track_confirmations.c.confirmation_count,
+            set_track_confirmations.c.denial_count,
+            set_track_confirmations.c.user_confirmation,
+            set_track_ratings.c.average_rating,
+            set_track_ratings.c.rating_count,
+            # SetTrack entries don't have Track ratings
+            cast(null(), TrackRating.rating.type).label('user_rating'),
+            *_added_by_columns()
+        )
+        .select_from(SetTrack)
+        .join(User, SetTrack.added_by_id == User.id)
+        .join(set_track_confirmations, true())
+        .join(set_track_ratings, true())
         .where(SetTrack.set_id == set_id)
-        .group_by(SetTrack.id)
     )
     
-    set_tracks_result = await db.execute(set_tracks_query)
-    set_tracks_with_stats = set_tracks_result.all()
-    
-    # Get all TrackSetLink entries for this set
+    link_confirmations = _confirmation_stats(
+        TrackConfirmation.track_set_link_id == TrackSetLink.id, current_user, 'link_confirmations'
+    )
+    link_ratings = _rating_stats(Track.id, 'link_ratings')
+    user_rating = (
+        select(TrackRating.rating)
+        .where(TrackRating.track_id == Track.id, TrackRating.user_id == current_user.id)
+        .scalar_subquery()
+        if current_user else cast(null(), TrackRating.rating.type)
+    )
     track_links_query = (
-        select(TrackSetLink, Track)
+        select(
+            TrackSetLink.id,  # Use link ID so it can be identified for deletion
+            TrackSetLink.set_id,
+            TrackSetLink.added_by_id,
+            Track.track_name,
+            Track.artist_name,
+            Track.soundcloud_url,
+            Track.soundcloud_track_id,
+            TrackSetLink.position,
+            TrackSetLink.timestamp_minutes,
+            false().label('is_top_track'),
+            cast(null(), Integer).label('top_track_order'),
+            TrackSetLink.created_at,
+            Track.id.label('track_entity_id'),
+            link_confirmations.c.confirmation_count,
+            link_confirmations.c.denial_count,
+            link_confirmations.c.user_confirmation,
+            link_ratings.c.average_rating,
+            link_ratings.c.rating_count,
+            user_rating.label('user_rating'),
+            *_added_by_columns()
+        )
+        .select_from(TrackSetLink)
         .join(Track, TrackSetLink.track_id == Track.id)
+        .join(User, TrackSetLink.added_by_id == User.id)
+        .join(link_confirmations, true())
+        .join(link_ratings, true())
         .where(TrackSetLink.set_id == set_id)
     )
     
-    track_links_result = await db.execute(track_links_query)
-    track_links_with_tracks = track_links_result.all()
-    
-    # Get user's confirmations and ratings if authenticated
-    user_confirmations = {}
-    user_ratings = {}
-    if current_user:
-        # Get SetTrack IDs for confirmations
-        set_track_ids = [t[0].id for t in set_tracks_with_stats]
-        if set_track_ids:
-            # Get user confirmations for SetTrack entries
-            user_conf_result = await db.execute(
-                select(TrackConfirmation)
-                .where(
-                    TrackConfirmation.user_id == current_user.id,
-                    TrackConfirmation.track_id.in_(set_track_ids)
-                )
-            )
-            for conf in user_conf_result.scalars().all():
-                if conf.track_id:
-                    user_confirmations[conf.track_id] = conf.is_confirmed
-        
-        # Get Track IDs for ratings (both SetTrack and TrackSetLink reference Track model for ratings)
-        track_ids_for_ratings = []
-        # From SetTrack entries - we need to check if they have a linked Track
-        # Actually, TrackRating references Track.id, not SetTrack.id
-        # So we need to get Track IDs from both sources
-        for link, track in track_links_with_tracks:
-            track_ids_for_ratings.append(track.id)
-        
-        if track_ids_for_ratings:
-            # Get user ratings for linked tracks
-            user_rating_result = await db.execute(
-                select(TrackRating)
-                .where(
-                    TrackRating.user_id == current_user.id,
-                    TrackRating.track_id.in_(track_ids_for_ratings)
-                )
-            )
-            for rating in user_rating_result.scalars().all():
-                user_ratings[rating.track_id] = rating.rating
+    tracks_query = (
+        union_all(set_tracks_query, track_links_query)
+        .order_by(literal_column('position').asc().nulls_last(), literal_column('created_at'))
+        .execution_options(yield_per=64)
+    )
     
-    # Build responses from SetTrack entries
+    # Stream the rows in batches so long setlists are not materialized all at once
     track_responses = []
-    for set_track, conf_count, deny_count, avg_rating, rating_count in set_tracks_with_stats:
-        await db.refresh(set_track, ["added_by"])
-        track_dict = SetTrackResponse.model_validate(set_track).model_dump()
-        if set_track.added_by:
-            from app.schemas import UserResponse
-            track_dict['added_by'] = UserResponse.model_validate(set_track.added_by).model_dump()
-        
-        # Add confirmation stats
-        track_dict['confirmation_count'] = conf_count or 0
-        track_dict['denial_count'] = deny_count or 0
-        track_dict['user_confirmation'] = user_confirmations.get(set_track.id)
-        track_dict['supports_confirmations'] = True  # SetTrack entries support confirmations
-        
-        # Add rating stats (SetTrack doesn't have direct Track reference, so no ratings for now)
+    tracks_result = await db.stream(tracks_query)
+    async for row in tracks_result.mappings():
+        # Rows come straight from the database with the response's own column
+        # types, so build the models without running validation per row
+        track_dict = dict(row)
+        track_dict['added_by'] = UserResponse.model_construct(**{
+            field: track_dict.pop(f'added_by_user_{field}') for field in _ADDED_BY_FIELDS
+        })
+        if track_dict['timestamp_minutes'] is not None:
+            track_dict['timestamp_minutes'] = float(track_dict['timestamp_minutes'])
+        avg_rating = track_dict['average_rating']
         track_dict['average_rating'] = float(avg_rating) if avg_rating else None
-        track_dict['rating_count'] = rating_count or 0
-        track_dict['user_rating'] = None  # SetTrack entries don't have Track ratings
-        
-        track_responses.append(SetTrackResponse(**track_dict))
-    
-    # Get TrackSetLink IDs for confirmations
-    track_link_ids = [link.id for link, track in track_links_with_tracks]
-    link_confirmations = {}
-    link_confirmation_counts = {}
-    
-    if track_link_ids:
-        # Get confirmation counts for TrackSetLink entries
-        link_conf_query = (
-            select(
-                TrackConfirmation.track_set_link_id,
-                func.sum(case((TrackConfirmation.is_confirmed == True, 1), else_=0)).label('conf_count'),
-                func.sum(case((TrackConfirmation.is_confirmed == False, 1), else_=0)).label('deny_count')
-            )
-            .where(TrackConfirmation.track_set_link_id.in_(track_link_ids))
-            .group_by(TrackConfirmation.track_set_link_id)
-        )
-        link_conf_result = await db.execute(link_conf_query)
-        for link_id, conf_count, deny_count in link_conf_result.all():
-            link_confirmation_counts[link_id] = {
-                'confirmation_count': conf_count or 0,
-                'denial_count': deny_count or 0
-            }
-        
-        # Get user confirmations for TrackSetLink entries
-        if current_user:
-            user_link_conf_result = await db.execute(
-                select(TrackConfirmation)
-                .where(
-                    TrackConfirmation.user_id == current_user.id,
-                    TrackConfirmation.track_set_link_id.in_(track_link_ids)
-                )
-            )
-            for conf in user_link_conf_result.scalars().all():
-                if conf.track_set_link_id:
-                    link_confirmations[conf.track_set_link_id] = conf.is_confirmed
-    
-    # Build responses from TrackSetLink entries
-    for link, track in track_links_with_tracks:
-        await db.refresh(link, ["added_by"])
-        await db.refresh(track)
-        
-        # Get rating stats for the Track
-        rating_query = (
-            select(
-                func.avg(TrackRating.rating).label('avg_rating'),
-                func.count(TrackRating.id).label('rating_count')
-            )
-            .where(TrackRating.track_id == track.id)
-        )
-        rating_result = await db.execute(rating_query)
-        rating_row = rating_result.first()
-        avg_rating = rating_row[0] if rating_row else None
-        rating_count = rating_row[1] or 0
-        
-        # Get confirmation stats for this link
-        link_conf_stats = link_confirmation_counts.get(link.id, {'confirmation_count': 0, 'denial_count': 0})
-        
-        # Convert TrackSetLink to SetTrackResponse format
-        track_dict = {
-            'id': link.id,  # Use link ID so it can be identified for deletion
-            'set_id': set_id,
-            'added_by_id': link.added_by_id,
-            'track_name': track.track_name,
-            'artist_name': track.artist_name,
-            'soundcloud_url': track.soundcloud_url,
-            'soundcloud_track_id': track.soundcloud_track_id,
-            'position': link.position,
-            'timestamp_minutes': float(link.timestamp_minutes) if link.timestamp_minutes is not None else None,
-            'created_at': link.created_at,
-            'is_top_track': False,
-            'top_track_order': None,
-            'confirmation_count': link_conf_stats['confirmation_count'],
-            'denial_count': link_conf_stats['denial_count'],
-            'user_confirmation': link_confirmations.get(link.id),
-            'supports_confirmations': True,
-            'average_rating': float(avg_rating) if avg_rating else None,
-            'rating_count': rating_count,
-            'user_rating': user_ratings.get(track.id),
-            'track_entity_id': track.id,
-        }
-        
-        if link.added_by:
-            from app.schemas import UserResponse
-            track_dict['added_by'] = UserResponse.model_validate(link.added_by).model_dump()
-        
-        track_responses.append(SetTrackResponse(**track_dict))
+        track_dict['supports_confirmations'] = True  # Both kinds of entries support confirmations
+        track_responses.append(SetTrackResponse.model_construct(**track_dict))
+    
+    # Only an empty result needs to tell an empty set apart from a missing one
+    if not track_responses:
+        set_exists = await db.execute(select(select(DJSet.id).where(DJSet.id == set_id).exists()))
+        if not set_exists.scalar():
+            raise SetNotFoundError(str(set_id))
     
-    # Sort all tracks by position and created_at
-    track_responses.sort(key=lambda x: (
-        x.position if x.position is not None else float('inf'),
-        x.created_at
-    ))
+    if current_user is None:
+        if len(set_tracks_cache) >= SET_TRACKS_CACHE_MAX_ENTRIES:
+            set_tracks_cache.clear()
+        set_tracks_cache[set_id] = (list(track_responses), datetime.utcnow() + SET_TRACKS_CACHE_TTL)
     
     return track_responses
 
@@ -274,57 +306,61 @@ async def get_set_tracks(
 async def add_track_tag(
     set_id: UUID,
     track_data: SetTrackCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Add a track tag to a set. Can link an existing Track entity or create a new SetTrack."""
-    # Check if set exists
-    result = await db.execute(select(DJSet).where(DJSet.id == set_id))
-    set_obj = result.scalar_one_or_none()
-    
-    if not set_obj:
-        raise SetNotFoundError(str(set_id))
+    set_exists = select(DJSet.id).where(DJSet.id == set_id).exists()
     
     # If track_id is provided, link existing Track entity via TrackSetLink
     if track_data.track_id:
-        # Verify track exists
-        track_result = await db.execute(select(Track).where(Track.id == track_data.track_id))
-        existing_track = track_result.scalar_one_or_none()
+        # Load the track and check the set in one round trip
+        checks = await db.execute(
+            select(Track, set_exists).where(Track.id == track_data.track_id)
+        )
+        row = checks.one_or_none()
         
-        if not existing_track:
+        if row is None:
+            # Unknown track - a missing set still takes precedence
+            if not (await db.execute(select(set_exists))).scalar():
+                raise SetNotFoundError(str(set_id))
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Track not found"
             )
         
-        # Check if link already exists
-        existing_link = await db.execute(
-            select(TrackSetLink).where(
-                TrackSetLink.track_id == track_data.track_id,
-                TrackSetLink.set_id == set_id
+        track, has_set = row
+        
+        if not has_set:
+            raise SetNotFoundError(str(set_id))
+        
+        # Create the TrackSetLink; uq_track_set_link turns a duplicate into no row
+        result = await db.execute(
+            pg_insert(TrackSetLink)
+            .values(
+                track_id=track_data.track_id,
+                set_id=set_id,
+                added_by_id=current_user.id,
+                position=track_data.position,
+                timestamp_minutes=track_data.timestamp_minutes
             )
+            .on_conflict_do_nothing(index_elements=['track_id', 'set_id'])
+            .returning(TrackSetLink)
         )
-        if existing_link.scalar_one_or_none():
+        new_link = result.scalar_one_or_none()
+        
+        if new_link is None:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="This track is already linked to this set"
             )
         
-        # Create TrackSetLink
-        new_link = TrackSetLink(
-            track_id=track_data.track_id,
-            set_id=set_id,
-            added_by_id=current_user.id,
-            position=track_data.position,
-            timestamp_minutes=track_data.timestamp_minutes
-        )
-        
-        db.add(new_link)
         await db.commit()
-        await db.refresh(new_link, ["track", "added_by"])
+        invalidate_set_tracks_cache(set_id)
+        invalidate_discover_cache()
         
         # Convert Track to SetTrackResponse format for consistency
-        track = new_link.track
         track_dict = {
             'id': new_link.id,  # Use link ID so it can be identified for deletion
             'set_id': set_id,
@@ -338,12 +374,9 @@ async def add_track_tag(
             'created_at': new_link.created_at,
             'is_top_track': False,
             'top_track_order': None,
+            'added_by': current_user,
         }
         
-        if new_link.added_by:
-            from app.schemas import UserResponse
-            track_dict['added_by'] = UserResponse.model_validate(new_link.added_by).model_dump()
-        
         return SetTrackResponse(**track_dict)
     
     # Otherwise, create a new SetTrack (original behavior)
@@ -353,50 +386,68 @@ async def add_track_tag(
             detail="track_name is required when track_id is not provided"
         )
     
-    # Check if track already exists (based on unique constraint)
-    existing = await db.execute(
-        select(SetTrack).where(
-            SetTrack.set_id == set_id,
-            SetTrack.track_name == track_data.track_name,
-            SetTrack.artist_name == track_data.artist_name
-        )
+    # Use a previously resolved SoundCloud track ID if we have one
+    soundcloud_track_id = None
+    if track_data.soundcloud_url:
+        soundcloud_track_id = _get_cached_soundcloud_track_id(track_data.soundcloud_url)
+    
+    # Insert the tag only if the set exists and it is not already tagged, in one
+    # round trip. NULL artist names never conflict in uq_set_track, so the
+    # duplicate check stays in the WHERE clause; ON CONFLICT covers racing inserts.
+    values = {
+        'id': uuid4(),
+        'set_id': set_id,
+        'added_by_id': current_user.id,
+        'track_name': track_data.track_name,
+        'artist_name': track_data.artist_name,
+        'soundcloud_url': track_data.soundcloud_url,
+        'soundcloud_track_id': soundcloud_track_id,
+        'position': track_data.position,
+        'timestamp_minutes': track_data.timestamp_minutes,
+        'is_top_track': False,
+        'created_at': datetime.utcnow(),
+    }
+    duplicate_exists = select(SetTrack.id).where(
+        SetTrack.set_id == set_id,
+        SetTrack.track_name == track_data.track_name,
+        SetTrack.artist_name == track_data.artist_name
+    ).exists()
+    result = await db.execute(
+        pg_insert(SetTrack)
+        .from_select(
+            list(values),
+            select(*(
+                literal(value, SetTrack.__table__.c[name].type)
+                for name, value in values.items()
+            )).where(set_exists, ~duplicate_exists)
+        )
+        .on_conflict_do_nothing(index_elements=['set_id', 'track_name', 'artist_name'])
+        .returning(SetTrack)
     )
-    if existing.scalar_one_or_none():
+    new_track = result.scalar_one_or_none()
+    
+    if new_track is None:
+        # Nothing inserted - tell a missing set apart from a duplicate tag
+        if not (await db.execute(select(set_exists))).scalar():
+            raise SetNotFoundError(str(set_id))
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="This track is already tagged for this set"
         )
     
-    # If SoundCloud URL provided, try to resolve it to get track ID
-    soundcloud_track_id = None
-    if track_data.soundcloud_url:
-        track_info = await soundcloud_search_service.resolve_soundcloud_url(track_data.soundcloud_url)
-        if track_info:
-            soundcloud_track_id = str(track_info.get("id"))
-    
-    # Create track tag
-    new_track = SetTrack(
-        set_id=set_id,
-        added_by_id=current_user.id,
-        track_name=track_data.track_name,
-        artist_name=track_data.artist_name,
-        soundcloud_url=track_data.soundcloud_url,
-        soundcloud_track_id=soundcloud_track_id,
-        position=track_data.position,
-        timestamp_minutes=track_data.timestamp_minutes
-    )
-    
-    db.add(new_track)
     await db.commit()
-    await db.refresh(new_track, ["added_by"])
+    invalidate_set_tracks_cache(set_id)
+    # The current user added this tag, so attach it instead of reloading it
+    set_committed_value(new_track, 'added_by', current_user)
     
-    # Convert to response
-    track_dict = SetTrackResponse.model_validate(new_track).model_dump()
-    if new_track.added_by:
-        from app.schemas import UserResponse
-        track_dict['added_by'] = UserResponse.model_validate(new_track.added_by).model_dump()
+    # Otherwise resolve the SoundCloud track ID once the response is sent
+    if track_data.soundcloud_url and soundcloud_track_id is None:
+        background_tasks.add_task(
+            _resolve_set_track_soundcloud_id, new_track.id, track_data.soundcloud_url
+        )
     
-    return SetTrackResponse(**track_dict)
+    # Convert to response
+    return SetTrackResponse.model_validate(new_track)
 
 
 @router.put("/{track_id}", response_model=SetTrackResponse)
@@ -404,16 +455,12 @@ async def update_track_tag(
     set_id: UUID,
     track_id: UUID,
     track_update: SetTrackUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Update a track tag (only if added by current user)."""
-    result = await db.execute(
-        select(SetTrack).where(
-            SetTrack.id == track_id,
-            SetTrack.set_id == set_id
-        )
-    )
+    result = await db.execute(_set_track_in_set_stmt(track_id, set_id))
     track_obj = result.scalar_one_or_none()
     
     if not track_obj:
@@ -436,26 +483,27 @@ async def update_track_tag(
         track_obj.artist_name = track_update.artist_name
     if track_update.soundcloud_url is not None:
         track_obj.soundcloud_url = track_update.soundcloud_url
-        # Re-resolve SoundCloud URL if changed
+        # Re-resolve SoundCloud URL, from cache or once the response is sent
         if track_update.soundcloud_url:
-            track_info = await soundcloud_search_service.resolve_soundcloud_url(track_update.soundcloud_url)
-            if track_info:
-                track_obj.soundcloud_track_id = str(track_info.get("id"))
+            cached_id = _get_cached_soundcloud_track_id(track_update.soundcloud_url)
+            if cached_id is not None:
+                track_obj.soundcloud_track_id = cached_id
+            else:
+                background_tasks.add_task(
+                    _resolve_set_track_soundcloud_id, track_obj.id, track_update.soundcloud_url
+                )
     if track_update.position is not None:
         track_obj.position = track_update.position
     if track_update.timestamp_minutes is not None:
         track_obj.timestamp_minutes = track_update.timestamp_minutes
     
     await db.commit()
-    await db.refresh(track_obj, ["added_by"])
+    invalidate_set_tracks_cache(set_id)
+    # The current user added this tag, so attach it instead of reloading it
+    set_committed_value(track_obj, 'added_by', current_user)
     
     # Convert to response
-    track_dict = SetTrackResponse.model_validate(track_obj).model_dump()
-    if track_obj.added_by:
-        from app.schemas import UserResponse
-        track_dict['added_by'] = UserResponse.model_validate(track_obj.added_by).model_dump()
-    
-    return SetTrackResponse(**track_dict)
+    return SetTrackResponse.model_validate(track_obj)
 
 
 @router.delete("/{track_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -466,53 +514,57 @@ async def remove_track_tag(
     db: AsyncSession = Depends(get_db)
 ):
     """Remove a track tag (SetTrack or TrackSetLink) - only if added by current user."""
-    # Try to find as SetTrack first
-    set_track_result = await db.execute(
-        select(SetTrack).where(
-            SetTrack.id == track_id,
-            SetTrack.set_id == set_id
-        )
-    )
-    set_track = set_track_result.scalar_one_or_none()
-    
-    if set_track:
-        # Check ownership
-        if set_track.added_by_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to remove this track tag"
-            )
-        
-        # Delete related confirmations first (due to foreign key constraint)
-        await db.execute(delete(TrackConfirmation).where(TrackConfirmation.track_id == track_id))
-        
-        # Delete the SetTrack
-        await db.execute(delete(SetTrack).where(SetTrack.id == track_id))
+    # Try to delete as a SetTrack owned by the current user. Confirmations of
+    # either kind of tag are removed by ON DELETE CASCADE foreign keys.
+    deleted = await db.execute(_delete_own_set_track_stmt(track_id, set_id, current_user.id))
+    if deleted.scalar_one_or_none() is not None:
         await db.commit()
+        invalidate_set_tracks_cache(set_id)
         return None
     
-    # Try to find as TrackSetLink
-    link_result = await db.execute(
-        select(TrackSetLink).where(
+    # Otherwise try to delete it as a TrackSetLink owned by the current user
+    deleted = await db.execute(
+        delete(TrackSetLink)
+        .where(
             TrackSetLink.id == track_id,
-            TrackSetLink.set_id == set_id
+            TrackSetLink.set_id == set_id,
+            TrackSetLink.added_by_id == current_user.id
         )
+        .returning(TrackSetLink.id)
     )
-    track_link = link_result.scalar_one_or_none()
-    
-    if track_link:
-        # Check ownership
-        if track_link.added_by_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to remove this track link"
-            )
-        
-        # Delete the TrackSetLink
-        await db.execute(delete(TrackSetLink).where(TrackSetLink.id == track_id))
+    if deleted.scalar_one_or_none() is not None:
         await db.commit()
+        invalidate_set_tracks_cache(set_id)
+        invalidate_discover_cache()
         return None
     
+    # Nothing deleted - tell someone else's tag apart from a missing one
+    lookup = await db.execute(
+        select(
+            select(SetTrack.id).where(
+                SetTrack.id == track_id,
+                SetTrack.set_id == set_id
+            ).exists(),
+            select(TrackSetLink.id).where(
+                TrackSetLink.id == track_id,
+                TrackSetLink.set_id == set_id
+            ).exists()
+        )
+    )
+    set_track_exists, link_exists = lookup.one()
+    
+    if set_track_exists:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to remove this track tag"
+        )
+    
+    if link_exists:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to remove this track link"
+        )
+    
     # Not found in either table
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -520,6 +572,49 @@ async def remove_track_tag(
     )
 
 
+async def _upsert_confirmation(
+    db: AsyncSession,
+    set_id: UUID,
+    current_user: User,
+    is_confirmed: bool,
+    track_id: Optional[UUID] = None,
+    track_set_link_id: Optional[UUID] = None
+) -> TrackConfirmationResponse:
+    """
+    Create or update the current user's confirmation for a SetTrack or TrackSetLink.
+    
+    Uses a single INSERT ... ON CONFLICT DO UPDATE against the matching
+    per-user unique constraint, so concurrent confirmations cannot race.
+    """
+    constraint = (
+        'uq_user_set_track_confirmation' if track_id
+        else 'uq_user_track_set_link_confirmation'
+    )
+    stmt = (
+        pg_insert(TrackConfirmation)
+        .values(
+            track_id=track_id,
+            track_set_link_id=track_set_link_id,
+            user_id=current_user.id,
+            is_confirmed=is_confirmed
+        )
+        .on_conflict_do_update(
+            constraint=constraint,
+            set_={'is_confirmed': is_confirmed, 'updated_at': datetime.utcnow()}
+        )
+        .returning(TrackConfirmation)
+        .execution_options(populate_existing=True)
+    )
+    result = await db.execute(stmt)
+    confirmation = result.scalar_one()
+    await db.commit()
+    invalidate_set_tracks_cache(set_id)
+    
+    # The confirming user is already loaded; attach it without another query
+    set_committed_value(confirmation, 'user', current_user)
+    return TrackConfirmationResponse.model_validate(confirmation)
+
+
 @router.post("/{track_id}/confirm", response_model=TrackConfirmationResponse, status_code=status.HTTP_201_CREATED)
 async def confirm_track(
     set_id: UUID,
@@ -529,106 +624,37 @@ async def confirm_track(
     db: AsyncSession = Depends(get_db)
 ):
     """Confirm or deny a track tag. Works for both SetTrack and TrackSetLink entries."""
-    # Check if it's a TrackSetLink first
-    link_result = await db.execute(
-        select(TrackSetLink).where(
-            TrackSetLink.id == track_id,
-            TrackSetLink.set_id == set_id
+    # Find out which kind of tag this is (if any) in one round trip
+    checks = await db.execute(
+        select(
+            select(TrackSetLink.id).where(
+                TrackSetLink.id == track_id,
+                TrackSetLink.set_id == set_id
+            ).exists(),
+            select(SetTrack.id).where(
+                SetTrack.id == track_id,
+                SetTrack.set_id == set_id
+            ).exists()
         )
     )
-    track_link = link_result.scalar_one_or_none()
+    is_link, is_set_track = checks.one()
     
-    if track_link:
+    if is_link:
         # Handle TrackSetLink confirmation
-        # Check if user already confirmed/denied this track link
-        existing = await db.execute(
-            select(TrackConfirmation).where(
-                TrackConfirmation.track_set_link_id == track_id,
-                TrackConfirmation.user_id == current_user.id
-            )
-        )
-        existing_conf = existing.scalar_one_or_none()
-        
-        if existing_conf:
-            # Update existing confirmation
-            existing_conf.is_confirmed = confirmation_data.is_confirmed
-            await db.commit()
-            await db.refresh(existing_conf, ["user"])
-            
-            conf_dict = TrackConfirmationResponse.model_validate(existing_conf).model_dump()
-            if existing_conf.user:
-                from app.schemas import UserResponse
-                conf_dict['user'] = UserResponse.model_validate(existing_conf.user).model_dump()
-            return TrackConfirmationResponse(**conf_dict)
-        else:
-            # Create new confirmation
-            new_confirmation = TrackConfirmation(
-                track_set_link_id=track_id,
-                user_id=current_user.id,
-                is_confirmed=confirmation_data.is_confirmed
-            )
-            db.add(new_confirmation)
-            await db.commit()
-            await db.refresh(new_confirmation, ["user"])
-            
-            conf_dict = TrackConfirmationResponse.model_validate(new_confirmation).model_dump()
-            if new_confirmation.user:
-                from app.schemas import UserResponse
-                conf_dict['user'] = UserResponse.model_validate(new_confirmation.user).model_dump()
-            return TrackConfirmationResponse(**conf_dict)
-    
-    # Check if track exists and belongs to set (SetTrack)
-    result = await db.execute(
-        select(SetTrack).where(
-            SetTrack.id == track_id,
-            SetTrack.set_id == set_id
+        return await _upsert_confirmation(
+            db, set_id, current_user, confirmation_data.is_confirmed, track_set_link_id=track_id
         )
-    )
-    track_obj = result.scalar_one_or_none()
     
-    if not track_obj:
+    if not is_set_track:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Track tag not found"
         )
     
     # Handle SetTrack confirmation
-    # Check if user already confirmed/denied this track
-    existing = await db.execute(
-        select(TrackConfirmation).where(
-            TrackConfirmation.track_id == track_id,
-            TrackConfirmation.user_id == current_user.id
-        )
+    return await _upsert_confirmation(
+        db, set_id, current_user, confirmation_data.is_confirmed, track_id=track_id
     )
-    existing_conf = existing.scalar_one_or_none()
-    
-    if existing_conf:
-        # Update existing confirmation
-        existing_conf.is_confirmed = confirmation_data.is_confirmed
-        await db.commit()
-        await db.refresh(existing_conf, ["user"])
-        
-        conf_dict = TrackConfirmationResponse.model_validate(existing_conf).model_dump()
-        if existing_conf.user:
-            from app.schemas import UserResponse
-            conf_dict['user'] = UserResponse.model_validate(existing_conf.user).model_dump()
-        return TrackConfirmationResponse(**conf_dict)
-    else:
-        # Create new confirmation
-        new_confirmation = TrackConfirmation(
-            track_id=track_id,
-            user_id=current_user.id,
-            is_confirmed=confirmation_data.is_confirmed
-        )
-        db.add(new_confirmation)
-        await db.commit()
-        await db.refresh(new_confirmation, ["user"])
-        
-        conf_dict = TrackConfirmationResponse.model_validate(new_confirmation).model_dump()
-        if new_confirmation.user:
-            from app.schemas import UserResponse
-            conf_dict['user'] = UserResponse.model_validate(new_confirmation.user).model_dump()
-        return TrackConfirmationResponse(**conf_dict)
 
 
 @router.delete("/{track_id}/confirm", status_code=status.HTTP_204_NO_CONTENT)
@@ -639,36 +665,27 @@ async def remove_track_confirmation(
     db: AsyncSession = Depends(get_db)
 ):
     """Remove a track confirmation. Works for both SetTrack and TrackSetLink entries."""
-    # Try to find confirmation for SetTrack
+    # Delete the user's confirmation for either a SetTrack or a TrackSetLink
     result = await db.execute(
-        select(TrackConfirmation).where(
-            TrackConfirmation.track_id == track_id,
-            TrackConfirmation.user_id == current_user.id
-        )
-    )
-    confirmation = result.scalar_one_or_none()
-    
-    # If not found, try TrackSetLink
-    if not confirmation:
-        result = await db.execute(
-            select(TrackConfirmation).where(
-                TrackConfirmation.track_set_link_id == track_id,
-                TrackConfirmation.user_id == current_user.id
+        delete(TrackConfirmation)
+        .where(
+            TrackConfirmation.user_id == current_user.id,
+            or_(
+                TrackConfirmation.track_id == track_id,
+                TrackConfirmation.track_set_link_id == track_id
             )
         )
-        confirmation = result.scalar_one_or_none()
+        .returning(TrackConfirmation.id)
+    )
     
-    if not confirmation:
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Confirmation not found"
         )
     
-    # Delete the confirmation
-    await db.execute(delete(TrackConfirmation).where(
-        TrackConfirmation.id == confirmation.id
-    ))
     await db.commit()
+    invalidate_set_tracks_cache(set_id)
     
     return None
 
@@ -687,12 +704,7 @@ async def set_top_track(
     If another track already has this order, it will be unmarked as top track.
     """
     # Get the track
-    result = await db.execute(
-        select(SetTrack).where(
-            SetTrack.id == track_id,
-            SetTrack.set_id == set_id
-        )
-    )
+    result = await db.execute(_set_track_in_set_stmt(track_id, set_id))
     track = result.scalar_one_or_none()
     
     if not track:
@@ -708,59 +720,33 @@ async def set_top_track(
             detail="You can only manage top tracks for tracks you added"
         )
     
-    # Check if user already has 5 top tracks (excluding current track if it's already a top track)
-    existing_top_count = await db.execute(
-        select(func.count(SetTrack.id)).where(
-            SetTrack.added_by_id == current_user.id,
-            SetTrack.is_top_track == True,
-            SetTrack.id != track_id
-        )
-    )
-    count = existing_top_count.scalar() or 0
-    
-    # If this track is not already a top track and user has 5 top tracks, unmark the one with the target order
-    if not track.is_top_track and count >= 5:
-        existing_order_track = await db.execute(
-            select(SetTrack).where(
-                SetTrack.added_by_id == current_user.id,
-                SetTrack.is_top_track == True,
-                SetTrack.top_track_order == order,
-                SetTrack.id != track_id
-            )
-        )
-        existing_track = existing_order_track.scalar_one_or_none()
-        if existing_track:
-            existing_track.is_top_track = False
-            existing_track.top_track_order = None
-    
-    # If another track already has this order (and it's not the current track), unmark it
-    existing_order_track = await db.execute(
-        select(SetTrack).where(
+    # If another of the user's tracks already has this order, unmark it
+    demoted = await db.execute(
+        update(SetTrack)
+        .where(
             SetTrack.added_by_id == current_user.id,
             SetTrack.is_top_track == True,
             SetTrack.top_track_order == order,
             SetTrack.id != track_id
         )
+        .values(is_top_track=False, top_track_order=None)
+        .returning(SetTrack.set_id)
     )
-    existing_track = existing_order_track.scalar_one_or_none()
-    if existing_track:
-        existing_track.is_top_track = False
-        existing_track.top_track_order = None
+    demoted_set_ids = demoted.scalars().all()
     
     # Mark this track as top track with the specified order
     track.is_top_track = True
     track.top_track_order = order
     
     await db.commit()
-    await db.refresh(track, ["added_by"])
+    invalidate_set_tracks_cache(set_id)
+    for demoted_set_id in demoted_set_ids:
+        invalidate_set_tracks_cache(demoted_set_id)
+    # The current user added this tag, so attach it instead of reloading it
+    set_committed_value(track, 'added_by', current_user)
     
     # Convert to response schema
-    track_dict = SetTrackResponse.model_validate(track).model_dump()
-    if track.added_by:
-        from app.schemas import UserResponse
-        track_dict['added_by'] = UserResponse.model_validate(track.added_by).model_dump()
-    
-    return SetTrackResponse(**track_dict)
+    return SetTrackResponse.model_validate(track)
 
 
 @router.delete("/{track_id}/unset-top", status_code=status.HTTP_204_NO_CONTENT)
@@ -772,12 +758,7 @@ async def unset_top_track(
 ):
     """Remove a track from top tracks."""
     # Get the track
-    result = await db.execute(
-        select(SetTrack).where(
-            SetTrack.id == track_id,
-            SetTrack.set_id == set_id
-        )
-    )
+    result = await db.execute(_set_track_in_set_stmt(track_id, set_id))
     track = result.scalar_one_or_none()
     
     if not track:
@@ -798,6 +779,7 @@ async def unset_top_track(
     track.top_track_order = None
     
     await db.commit()
+    invalidate_set_tracks_cache(set_id)
     
     return None
 
@@ -806,7 +788,7 @@ async def unset_top_track(
 # TRACK DISCOVERY ENDPOINTS
 # ============================================================================
 
-@discover_router.get("", response_model=PaginatedResponse)
+@discover_router.get("", response_model=CursorPaginatedResponse)
 async def discover_tracks(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
@@ -814,6 +796,7 @@ async def discover_tracks(
     artist_name: Optional[str] = Query(None),
     sort: str = Query("created_at", pattern="^(created_at|track_name|artist_name|average_rating|rating_count)$"),
     order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_user)
 ):
@@ -827,16 +810,46 @@ async def discover_tracks(
     - artist_name: Filter by artist name
     - sort: Sort field (created_at, track_name, artist_name, average_rating, rating_count)
     - order: Sort order (asc, desc)
+    - cursor: next_cursor from a previous page, to continue after it without
+      an offset (created_at sort only). page is ignored, and keyset pages
+      are not counted, so total and pages are null in the response. A
+      malformed cursor, or one used with another sort, is a 400.
+    
+    next_cursor is set whenever a created_at page is full, and null otherwise.
     """
-    # Build base query with rating stats - using Track model, not SetTrack
+    keyset = None
+    if cursor is not None:
+        if sort != "created_at":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is only supported when sorting by created_at"
+            )
+        try:
+            keyset = _decode_discover_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    # Anonymous visitors browsing the same filters get the same page
+    cache_key = (search, artist_name, sort, order, page, limit, cursor)
+    if current_user is None:
+        cached = discover_cache.get(cache_key)
+        if cached and datetime.utcnow() < cached[1]:
+            return cached[0]
+    
+    # Build base query with rating stats - using Track model, not SetTrack.
+    # The stats are a per-track LATERAL aggregate rather than a GROUP BY, so
+    # a created_at page can be read off the index and stop at the limit.
+    rating_stats = _rating_stats(Track.id, 'track_rating_stats')
     query = (
         select(
             Track,
-            func.avg(TrackRating.rating).label('avg_rating'),
-            func.count(TrackRating.id).label('rating_count')
+            rating_stats.c.average_rating.label('avg_rating'),
+            rating_stats.c.rating_count
         )
-        .outerjoin(TrackRating, Track.id == TrackRating.track_id)
-        .group_by(Track.id)
+        .join(rating_stats, true())
     )
     
     # Apply filters
@@ -850,6 +863,9 @@ async def discover_tracks(
     if artist_name:
         query = query.where(Track.artist_name.ilike(f"%{artist_name}%"))
     
+    # Filtered but unpaginated, for counting when a page is past the end
+    count_source = query
+    
     # Apply sorting
     sort_column = None
     if sort == "track_name":
@@ -857,92 +873,105 @@ async def discover_tracks(
     elif sort == "artist_name":
         sort_column = Track.artist_name
     elif sort == "average_rating":
-        sort_column = func.avg(TrackRating.rating)
+        sort_column = rating_stats.c.average_rating
     elif sort == "rating_count":
-        sort_column = func.count(TrackRating.id)
+        sort_column = rating_stats.c.rating_count
     else:  # created_at (default)
         sort_column = Track.created_at
     
-    if order == "asc":
+    if sort == "created_at":
+        # created_at is never NULL, so order exactly like the (created_at, id)
+        # index; the id tiebreak gives pages and cursors one total order
+        if order == "asc":
+            query = query.order_by(Track.created_at.asc(), Track.id.asc())
+        else:
+            query = query.order_by(Track.created_at.desc(), Track.id.desc())
+    elif order == "asc":
         query = query.order_by(sort_column.asc().nulls_last())
     else:
         query = query.order_by(sort_column.desc().nulls_last())
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-    
-    # Apply pagination
-    offset = (page - 1) * limit
-    query = query.offset(offset).limit(limit)
+    if keyset is not None:
+        # Keyset pagination: continue strictly after the cursor's row
+        position = tuple_(Track.created_at, Track.id)
+        query = query.where(position > keyset if order == "asc" else position < keyset)
+        query = query.add_columns(null().label('total'))
+    else:
+        # Apply pagination. COUNT(*) OVER () returns the number of matching
+        # tracks alongside the page in one query.
+        offset = (page - 1) * limit
+        query = query.add_columns(func.count().over().label('total')).offset(offset)
+    query = query.limit(limit).execution_options(yield_per=50)
+    
+    # Stream the page in batches, keeping only the response columns of each
+    # row rather than the ORM rows themselves. Track columns come straight
+    # from the database with the response's own types, so the models are
+    # constructed without validation once the per-page lookups are in.
+    track_dicts = []
+    total = 0
+    result = await db.stream(query)
+    async for track, avg_rating, rating_count, row_total in result:
+        total = row_total
+        track_dict = {column: getattr(track, column) for column in TRACK_RESPONSE_COLUMNS}
+        track_dict['average_rating'] = float(avg_rating) if avg_rating else None
+        track_dict['rating_count'] = rating_count or 0
+        track_dicts.append(track_dict)
     
-    # Execute query
-    result = await db.execute(query)
-    tracks_with_stats = result.all()
+    if not track_dicts and page > 1 and keyset is None:
+        # Past the last page there are no rows to carry the window total
+        count_result = await db.execute(
+            select(func.count()).select_from(count_source.subquery())
+        )
+        total = count_result.scalar() or 0
     
-    # Get user ratings and top track status if authenticated
+    # Get linked sets counts, plus user ratings and top track status if
+    # authenticated, for the whole page in one query over its track ids.
+    # Binding the ids as one array keeps the SQL text identical for every page size.
     user_ratings = {}
     user_top_tracks = {}
-    if current_user:
-        track_ids = [t[0].id for t in tracks_with_stats]
-        if track_ids:
-            # Get user ratings
-            user_rating_result = await db.execute(
-                select(TrackRating)
-                .where(
-                    TrackRating.user_id == current_user.id,
-                    TrackRating.track_id.in_(track_ids)
-                )
-            )
-            for rating in user_rating_result.scalars().all():
-                user_ratings[rating.track_id] = rating.rating
-            
-            # Get user top tracks
-            from app.models import UserTopTrack
-            user_top_result = await db.execute(
-                select(UserTopTrack)
-                .where(
-                    UserTopTrack.user_id == current_user.id,
-                    UserTopTrack.track_id.in_(track_ids)
-                )
-            )
-            for top_track in user_top_result.scalars().all():
-                user_top_tracks[top_track.track_id] = {
+    linked_sets_counts = {}
+    if track_dicts:
+        track_ids = [track_dict['id'] for track_dict in track_dicts]
+        page_ids = func.unnest(
+            bindparam('track_ids', track_ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+        ).table_valued('id').render_derived(name='page_ids')
+        
+        lookup_columns = [
+            page_ids.c.id,
+            select(func.count(TrackSetLink.id))
+            .where(TrackSetLink.track_id == page_ids.c.id)
+            .scalar_subquery().label('linked_sets_count'),
+        ]
+        if current_user:
+            lookup_columns += [
+                select(TrackRating.rating)
+                .where(TrackRating.user_id == current_user.id, TrackRating.track_id == page_ids.c.id)
+                .scalar_subquery().label('user_rating'),
+                select(UserTopTrack.order)
+                .where(UserTopTrack.user_id == current_user.id, UserTopTrack.track_id == page_ids.c.id)
+                .scalar_subquery().label('top_track_order'),
+            ]
+        
+        lookup_result = await db.execute(select(*lookup_columns))
+        for row in lookup_result.mappings():
+            linked_sets_counts[row['id']] = row['linked_sets_count']
+            if row.get('user_rating') is not None:
+                user_ratings[row['id']] = row['user_rating']
+            if row.get('top_track_order') is not None:
+                user_top_tracks[row['id']] = {
                     'is_top_track': True,
-                    'top_track_order': top_track.order
+                    'top_track_order': row['top_track_order']
                 }
     
-    # Get linked sets count for each track
-    from app.models import TrackSetLink
-    linked_sets_counts = {}
-    if tracks_with_stats:
-        track_ids = [t[0].id for t in tracks_with_stats]
-        linked_sets_query = (
-            select(
-                TrackSetLink.track_id,
-                func.count(TrackSetLink.id).label('count')
-            )
-            .where(TrackSetLink.track_id.in_(track_ids))
-            .group_by(TrackSetLink.track_id)
-        )
-        linked_sets_result = await db.execute(linked_sets_query)
-        for track_id, count in linked_sets_result.all():
-            linked_sets_counts[track_id] = count
-    
-    # Load relationships and build responses
+    # Build responses
     track_responses = []
-    for track, avg_rating, rating_count in tracks_with_stats:
-        track_dict = TrackResponse.model_validate(track).model_dump()
-        
-        # Add rating stats
-        track_dict['average_rating'] = float(avg_rating) if avg_rating else None
-        track_dict['rating_count'] = rating_count or 0
-        track_dict['user_rating'] = user_ratings.get(track.id)
-        track_dict['linked_sets_count'] = linked_sets_counts.get(track.id, 0)
+    for track_dict in track_dicts:
+        track_id = track_dict['id']
+        track_dict['user_rating'] = user_ratings.get(track_id)
+        track_dict['linked_sets_count'] = linked_sets_counts.get(track_id, 0)
         
         # Add top track status
-        top_track_info = user_top_tracks.get(track.id)
+        top_track_info = user_top_tracks.get(track_id)
         if top_track_info:
             track_dict['is_top_track'] = top_track_info['is_top_track']
             track_dict['top_track_order'] = top_track_info['top_track_order']
@@ -950,15 +979,32 @@ async def discover_tracks(
             track_dict['is_top_track'] = False
             track_dict['top_track_order'] = None
         
-        track_responses.append(TrackResponse(**track_dict))
+        track_responses.append(TrackResponse.model_construct(**track_dict))
     
-    # Calculate pages
-    pages = (total + limit - 1) // limit if total > 0 else 0
+    # A full created_at page can be continued from its last track
+    next_cursor = None
+    if sort == "created_at" and len(track_dicts) == limit:
+        last_track = track_dicts[-1]
+        next_cursor = _encode_discover_cursor(last_track['created_at'], last_track['id'])
     
-    return PaginatedResponse(
+    # Calculate pages; keyset pages are not counted
+    if keyset is not None:
+        total = pages = None
+    else:
+        pages = (total + limit - 1) // limit if total > 0 else 0
+    
+    response = CursorPaginatedResponse(
         items=track_responses,
         total=total,
         page=page,
         limit=limit,
-        pages=pages
+        pages=pages,
+        next_cursor=next_cursor
     )
+    
+    if current_user is None:
+        if len(discover_cache) >= DISCOVER_CACHE_MAX_ENTRIES:
+            discover_cache.clear()
+        discover_cache[cache_key] = (response, datetime.utcnow() + DISCOVER_CACHE_TTL)
+    
+    return response
@@ -6,44 +6,177 @@ Handles user profiles, statistics, and following functionality.
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, join, or_
+from sqlalchemy import select, func, delete, join, or_, cast, Numeric, bindparam, Integer
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from uuid import UUID
 from typing import Optional
+from datetime import datetime
+from functools import lru_cache
 
 from app.database import get_db
-from app.models import User, Follow, UserSetLog, Review, List, Rating, DJSet, EventConfirmation, Event, SetTrack, Track, UserTopTrack, UserTopEvent, UserTopVenue, Venue, TrackReview, TrackRating
-from app.schemas import UserResponse, UserUpdate, UserStats, PaginatedResponse, SetTrackResponse, TrackResponse, ActivityItem, ReviewResponse, RatingResponse, TrackReviewResponse, TrackRatingResponse, DJSetResponse, LogResponse, EventResponse, VenueResponse
-from app.auth import get_current_active_user
-from fastapi import Security
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
-from app.config import settings
+from app.models import User, Follow, UserSetLog, Review, Rating, EventConfirmation, Event, SetTrack, Track, UserTopTrack, UserTopEvent, UserTopVenue, Venue, TrackReview, TrackRating, UserStatsRow, Activity
+from app.schemas import UserResponse, UserProfileResponse, UserUpdate, UserStats, FollowBatchCreate, PaginatedResponse, SetTrackResponse, TrackResponse, ActivityItem, ReviewResponse, RatingResponse, TrackReviewResponse, TrackRatingResponse, DJSetResponse, LogResponse, EventResponse, VenueResponse
+from app.auth import get_current_active_user, get_optional_user, get_optional_user_id
 from app.core.exceptions import ForbiddenError, DuplicateEntryError
+from app.core.cache import (
+    activity_feed_cache, ACTIVITY_FEED_CACHE_MAX_ENTRIES, ACTIVITY_FEED_CACHE_TTL,
+    invalidate_activity_feed_cache,
+)
+from app.core.tracks import TRACK_RESPONSE_COLUMNS
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
-security = HTTPBearer(auto_error=False)
+# Activity feed sources: (activity type, model, eager loads). The activities
+# table says which rows are on a page; the eager loads cover everything
+# _activity_item reads for them, and other relationships raise.
+_ACTIVITY_SOURCES = (
+    ("set_review", Review, (joinedload(Review.user), joinedload(Review.set))),
+    ("set_rating", Rating, (joinedload(Rating.user), joinedload(Rating.set))),
+    ("track_review", TrackReview, (joinedload(TrackReview.user), joinedload(TrackReview.track))),
+    ("track_rating", TrackRating, (joinedload(TrackRating.user), joinedload(TrackRating.track))),
+    ("top_track", UserTopTrack, (joinedload(UserTopTrack.user), joinedload(UserTopTrack.track))),
+    ("top_set", UserSetLog, (joinedload(UserSetLog.user), joinedload(UserSetLog.set))),
+    ("event_created", Event, (joinedload(Event.created_by),)),
+    ("event_confirmed", EventConfirmation, (joinedload(EventConfirmation.user), joinedload(EventConfirmation.event))),
+)
+
+
+def _build_activity_feed_queries(friends_only: bool) -> tuple:
+    """
+    Build the feed's page and count statements once.
+    
+    Every activity source is denormalized into the trigger-maintained
+    activities table, so a page is one scan of its created_at index (or the
+    user_id, created_at index for friends feeds). The primary key breaks
+    created_at ties so rows with equal timestamps keep their place across
+    pages. Followed users are matched with a subquery on the follower_id
+    parameter, so their ids never round-trip through Python.
+    """
+    conditions = []
+    if friends_only:
+        conditions.append(Activity.user_id.in_(
+            select(Follow.following_id).where(Follow.follower_id == bindparam("follower_id"))
+        ))
+    
+    page_query = (
+        select(Activity.source_id.label("id"), Activity.activity_type)
+        .where(*conditions)
+        .order_by(Activity.created_at.desc(), Activity.activity_type.desc(), Activity.source_id.desc())
+        .offset(bindparam("offset", type_=Integer))
+        .limit(bindparam("limit", type_=Integer))
+    )
+    count_query = select(func.count()).select_from(Activity).where(*conditions)
+    return page_query, count_query
 
 
-async def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(security),
-    db: AsyncSession = Depends(get_db)
-) -> Optional[User]:
-    """Optional dependency to get current user if authenticated."""
-    if not credentials:
-        return None
-    try:
-        payload = jwt.decode(
-            credentials.credentials, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
-        user_id: Optional[str] = payload.get("sub")
-        if user_id is None:
-            return None
-        result = await db.execute(select(User).where(User.id == UUID(user_id)))
-        user = result.scalar_one_or_none()
-        return user
-    except:
-        return None
+# The feed statements only differ per request in their parameters, so they are
+# built here rather than on every call: everyone's feed and the friends feed
+_ACTIVITY_FEED_QUERIES = {
+    False: _build_activity_feed_queries(friends_only=False),
+    True: _build_activity_feed_queries(friends_only=True),
+}
+
+
+async def _load_activity_rows(db: AsyncSession, model, options, ids: list) -> list:
+    """Load one activity type's rows by id, with its eager loads."""
+    result = await db.execute(
+        select(model)
+        .options(*options, raiseload('*'))
+        .where(model.id.in_(ids))
+    )
+    return result.scalars().all()
+
+
+@lru_cache(maxsize=None)
+def _response_columns(schema, model) -> tuple:
+    """Names of a response schema's fields that are plain columns on a model."""
+    return tuple(name for name in schema.model_fields if name in model.__mapper__.column_attrs)
+
+
+def _construct(schema, obj, **related):
+    """
+    Build a response model from an ORM row without validation.
+    
+    Column values already have the response's types; relationship fields are
+    passed in as constructed models and the rest keep their defaults.
+    """
+    values = {name: getattr(obj, name) for name in _response_columns(schema, type(obj))}
+    return schema.model_construct(**values, **related)
+
+
+def _shared_dump(memo: dict, schema, obj) -> dict:
+    """
+    Dump a related row once per feed pass.
+    
+    Authors, sets, tracks and events recur across a page, so their dicts are
+    kept in memo by (schema, id) and the same dict is reused by every item.
+    """
+    key = (schema, obj.id)
+    dumped = memo.get(key)
+    if dumped is None:
+        dumped = memo[key] = _construct(schema, obj).model_dump()
+    return dumped
+
+
+def _activity_item(activity_type: str, obj, memo: dict) -> dict:
+    """Build an activity feed item from a row loaded with its relationships."""
+    user = _shared_dump(memo, UserResponse, obj.created_by if activity_type == "event_created" else obj.user)
+    item = {
+        "activity_type": activity_type,
+        "created_at": obj.created_at,
+        "user": user,
+        "set_review": None,
+        "set_rating": None,
+        "track_review": None,
+        "track_rating": None,
+        "top_track": None,
+        "top_set": None,
+        "event_created": None,
+        "event_confirmed": None,
+    }
+    
+    if activity_type == "set_review":
+        review_dict = _construct(ReviewResponse, obj).model_dump()
+        review_dict["user"] = user
+        if obj.set:
+            review_dict["set"] = _shared_dump(memo, DJSetResponse, obj.set)
+        item["set_review"] = review_dict
+    elif activity_type == "set_rating":
+        rating_dict = _construct(RatingResponse, obj).model_dump()
+        rating_dict["set"] = _shared_dump(memo, DJSetResponse, obj.set) if obj.set else None
+        item["set_rating"] = rating_dict
+    elif activity_type == "track_review":
+        review_dict = _construct(TrackReviewResponse, obj).model_dump()
+        review_dict["user"] = user
+        review_dict["track"] = _shared_dump(memo, TrackResponse, obj.track) if obj.track else None
+        item["track_review"] = review_dict
+    elif activity_type == "track_rating":
+        rating_dict = _construct(TrackRatingResponse, obj).model_dump()
+        rating_dict["user"] = user
+        rating_dict["track"] = _shared_dump(memo, TrackResponse, obj.track) if obj.track else None
+        item["track_rating"] = rating_dict
+    elif activity_type == "top_track":
+        item["top_track"] = {
+            "track": _shared_dump(memo, TrackResponse, obj.track),
+            "order": obj.order,
+        }
+    elif activity_type == "top_set":
+        set_dict = _shared_dump(memo, DJSetResponse, obj.set)
+        log_dict = _construct(LogResponse, obj).model_dump()
+        log_dict["set"] = set_dict
+        item["top_set"] = {
+            "set": set_dict,
+            "log": log_dict,
+            "order": obj.top_set_order,
+        }
+    elif activity_type == "event_created":
+        item["event_created"] = {"event": _shared_dump(memo, EventResponse, obj)}
+    elif activity_type == "event_confirmed":
+        item["event_confirmed"] = {"event": _shared_dump(memo, EventResponse, obj.event)}
+    
+    return item
+
 
 
 @router.get("", response_model=PaginatedResponse)
@@ -61,7 +194,7 @@ async def search_users(
     - limit: Items per page (1-100)
     - search: Search query (searches username and display_name)
     """
-    query = select(User)
+    query = select(User).options(raiseload('*'))
     
     # Apply search filter
     if search:
@@ -109,7 +242,7 @@ async def get_activity_feed(
     limit: int = Query(20, ge=1, le=100),
     friends_only: str = Query("false"),
     db: AsyncSession = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_user)
+    current_user_id: Optional[UUID] = Depends(get_optional_user_id)
 ):
     """
     Get activity feed showing reviews, ratings, top track/set additions, and event activities.
@@ -130,219 +263,67 @@ async def get_activity_feed(
     friends_only_bool = friends_only_lower in ('true', '1', 'yes', 'on', 't')
     
     # Determine which users' activity to show
-    user_ids = None
-    if friends_only_bool:
-        if not current_user:
-            return {
-                "items": [],
-                "total": 0,
-                "page": page,
-                "limit": limit,
-                "pages": 0
-            }
-        # Get list of followed user IDs
-        following_result = await db.execute(
-            select(Follow.following_id).where(Follow.follower_id == current_user.id)
-        )
-        user_ids = [row[0] for row in following_result.all()]
-        
-        if not user_ids:
-            return {
-                "items": [],
-                "total": 0,
-                "page": page,
-                "limit": limit,
-                "pages": 0
-            }
-    
-    activities = []
-    
-    def _base_activity(activity_type, created_at, user_resp):
+    if friends_only_bool and not current_user_id:
         return {
-            "activity_type": activity_type,
-            "created_at": created_at,
-            "user": user_resp,
-            "set_review": None,
-            "set_rating": None,
-            "track_review": None,
-            "track_rating": None,
-            "top_track": None,
-            "top_set": None,
-            "event_created": None,
-            "event_confirmed": None,
+            "items": [],
+            "total": 0,
+            "page": page,
+            "limit": limit,
+            "pages": 0
         }
-
-    # Each section is wrapped in try/except so a missing table doesn't break the whole feed
-    try:
-        set_reviews_query = select(Review).where(Review.is_public == True)
-        if user_ids:
-            set_reviews_query = set_reviews_query.where(Review.user_id.in_(user_ids))
-        set_reviews_query = set_reviews_query.order_by(Review.created_at.desc()).limit(limit * 3)
-        set_reviews_result = await db.execute(set_reviews_query)
-        set_reviews = set_reviews_result.scalars().all()
-        
-        for review in set_reviews:
-            await db.refresh(review, ["user", "set"])
-            review_dict = ReviewResponse.model_validate(review).model_dump()
-            if review.set:
-                review_dict["set"] = DJSetResponse.model_validate(review.set).model_dump()
-            act = _base_activity("set_review", review.created_at, UserResponse.model_validate(review.user).model_dump())
-            act["set_review"] = review_dict
-            activities.append(act)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Activity feed: failed to load set reviews: {e}")
-
-    try:
-        set_ratings_query = select(Rating)
-        if user_ids:
-            set_ratings_query = set_ratings_query.where(Rating.user_id.in_(user_ids))
-        set_ratings_query = set_ratings_query.order_by(Rating.created_at.desc()).limit(limit * 3)
-        set_ratings_result = await db.execute(set_ratings_query)
-        set_ratings = set_ratings_result.scalars().all()
-        
-        for rating in set_ratings:
-            await db.refresh(rating, ["user", "set"])
-            rating_dict = RatingResponse.model_validate(rating).model_dump()
-            rating_dict["set"] = DJSetResponse.model_validate(rating.set).model_dump() if rating.set else None
-            act = _base_activity("set_rating", rating.created_at, UserResponse.model_validate(rating.user).model_dump())
-            act["set_rating"] = rating_dict
-            activities.append(act)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Activity feed: failed to load set ratings: {e}")
-
-    try:
-        track_reviews_query = select(TrackReview).where(TrackReview.is_public == True)
-        if user_ids:
-            track_reviews_query = track_reviews_query.where(TrackReview.user_id.in_(user_ids))
-        track_reviews_query = track_reviews_query.order_by(TrackReview.created_at.desc()).limit(limit * 3)
-        track_reviews_result = await db.execute(track_reviews_query)
-        track_reviews = track_reviews_result.scalars().all()
-        
-        for review in track_reviews:
-            await db.refresh(review, ["user", "track"])
-            review_dict = TrackReviewResponse.model_validate(review).model_dump()
-            review_dict["track"] = TrackResponse.model_validate(review.track).model_dump() if review.track else None
-            act = _base_activity("track_review", review.created_at, UserResponse.model_validate(review.user).model_dump())
-            act["track_review"] = review_dict
-            activities.append(act)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Activity feed: failed to load track reviews: {e}")
-
-    try:
-        track_ratings_query = select(TrackRating)
-        if user_ids:
-            track_ratings_query = track_ratings_query.where(TrackRating.user_id.in_(user_ids))
-        track_ratings_query = track_ratings_query.order_by(TrackRating.created_at.desc()).limit(limit * 3)
-        track_ratings_result = await db.execute(track_ratings_query)
-        track_ratings = track_ratings_result.scalars().all()
-        
-        for rating in track_ratings:
-            await db.refresh(rating, ["user", "track"])
-            rating_dict = TrackRatingResponse.model_validate(rating).model_dump()
-            rating_dict["track"] = TrackResponse.model_validate(rating.track).model_dump() if rating.track else None
-            act = _base_activity("track_rating", rating.created_at, UserResponse.model_validate(rating.user).model_dump())
-            act["track_rating"] = rating_dict
-            activities.append(act)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Activity feed: failed to load track ratings: {e}")
-
-    try:
-        top_tracks_query = select(UserTopTrack)
-        if user_ids:
-            top_tracks_query = top_tracks_query.where(UserTopTrack.user_id.in_(user_ids))
-        top_tracks_query = top_tracks_query.order_by(UserTopTrack.created_at.desc()).limit(limit * 3)
-        top_tracks_result = await db.execute(top_tracks_query)
-        top_tracks = top_tracks_result.scalars().all()
-        
-        for top_track in top_tracks:
-            await db.refresh(top_track, ["user", "track"])
-            act = _base_activity("top_track", top_track.created_at, UserResponse.model_validate(top_track.user).model_dump())
-            act["top_track"] = {
-                "track": TrackResponse.model_validate(top_track.track).model_dump(),
-                "order": top_track.order,
-            }
-            activities.append(act)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Activity feed: failed to load top tracks: {e}")
-
-    try:
-        top_sets_query = select(UserSetLog).where(UserSetLog.is_top_set == True)
-        if user_ids:
-            top_sets_query = top_sets_query.where(UserSetLog.user_id.in_(user_ids))
-        top_sets_query = top_sets_query.order_by(UserSetLog.created_at.desc()).limit(limit * 3)
-        top_sets_result = await db.execute(top_sets_query)
-        top_sets = top_sets_result.scalars().all()
-        
-        for log in top_sets:
-            await db.refresh(log, ["user", "set"])
-            act = _base_activity("top_set", log.created_at, UserResponse.model_validate(log.user).model_dump())
-            act["top_set"] = {
-                "set": DJSetResponse.model_validate(log.set).model_dump(),
-                "log": LogResponse.model_validate(log).model_dump(),
-                "order": log.top_set_order,
-            }
-            activities.append(act)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Activity feed: failed to load top sets: {e}")
-
-    try:
-        events_query = select(Event)
-        if user_ids:
-            events_query = events_query.where(Event.created_by_id.in_(user_ids))
-        events_query = events_query.order_by(Event.created_at.desc()).limit(limit * 3)
-        events_result = await db.execute(events_query)
-        events = events_result.scalars().all()
-        
-        for event in events:
-            await db.refresh(event, ["created_by"])
-            act = _base_activity("event_created", event.created_at, UserResponse.model_validate(event.created_by).model_dump())
-            act["event_created"] = {"event": EventResponse.model_validate(event).model_dump()}
-            activities.append(act)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Activity feed: failed to load events: {e}")
-
-    try:
-        event_confirmations_query = select(EventConfirmation)
-        if user_ids:
-            event_confirmations_query = event_confirmations_query.where(EventConfirmation.user_id.in_(user_ids))
-        event_confirmations_query = event_confirmations_query.order_by(EventConfirmation.created_at.desc()).limit(limit * 3)
-        event_confirmations_result = await db.execute(event_confirmations_query)
-        event_confirmations = event_confirmations_result.scalars().all()
-        
-        for confirmation in event_confirmations:
-            await db.refresh(confirmation, ["user", "event"])
-            act = _base_activity("event_confirmed", confirmation.created_at, UserResponse.model_validate(confirmation.user).model_dump())
-            act["event_confirmed"] = {"event": EventResponse.model_validate(confirmation.event).model_dump()}
-            activities.append(act)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Activity feed: failed to load event confirmations: {e}")
-    
-    # Sort all activities by created_at (most recent first)
-    activities.sort(key=lambda x: x["created_at"], reverse=True)
     
-    # Apply pagination
-    total = len(activities)
+    # Everyone sees the same unfiltered feed; friends feeds are per follower
+    cache_key = (current_user_id if friends_only_bool else None, page, limit)
+    cached = activity_feed_cache.get(cache_key)
+    if cached and datetime.utcnow() < cached[1]:
+        return cached[0]
+    
+    page_query, count_query = _ACTIVITY_FEED_QUERIES[friends_only_bool]
+    params = {"follower_id": current_user_id} if friends_only_bool else {}
+    
+    # Counting separately keeps the page itself a LIMITed index scan
     offset = (page - 1) * limit
-    paginated_activities = activities[offset:offset + limit]
+    page_result = await db.execute(page_query, {**params, "offset": offset, "limit": limit})
+    page_rows = page_result.all()
+    count_result = await db.execute(count_query, params)
+    total = count_result.scalar() or 0
+    
+    ids_by_type = {}
+    for row in page_rows:
+        ids_by_type.setdefault(row.activity_type, []).append(row.id)
+    
+    # Load the page's rows with their relationships: one small indexed IN
+    # query per activity type present, on the request's own session
+    loaded = {}
+    for activity_type, model, options in _ACTIVITY_SOURCES:
+        if activity_type in ids_by_type:
+            for obj in await _load_activity_rows(db, model, options, ids_by_type[activity_type]):
+                loaded[(activity_type, obj.id)] = obj
+    
+    # A source row deleted after the page query has nothing to show; skip it
+    # rather than fail the page
+    memo = {}
+    paginated_activities = [
+        _activity_item(row.activity_type, loaded[(row.activity_type, row.id)], memo)
+        for row in page_rows
+        if (row.activity_type, row.id) in loaded
+    ]
     
     pages = (total + limit - 1) // limit if total > 0 else 0
     
-    # Return as dict for now to debug
-    return {
+    response = {
         "items": paginated_activities,
         "total": total,
         "page": page,
         "limit": limit,
         "pages": pages
     }
+    
+    if len(activity_feed_cache) >= ACTIVITY_FEED_CACHE_MAX_ENTRIES:
+        activity_feed_cache.clear()
+    activity_feed_cache[cache_key] = (response, datetime.utcnow() + ACTIVITY_FEED_CACHE_TTL)
+    
+    return response
 
 
 @router.get("/{user_id}/follow-status")
@@ -356,19 +337,22 @@ async def get_follow_status(
         return {"is_following": False, "is_own_profile": True}
     
     result = await db.execute(
-        select(Follow).where(
-            Follow.follower_id == current_user.id,
-            Follow.following_id == user_id
+        select(
+            select(Follow.id).where(
+                Follow.follower_id == current_user.id,
+                Follow.following_id == user_id
+            ).exists()
         )
     )
-    follow = result.scalar_one_or_none()
+    is_following = result.scalar()
     
-    return {"is_following": follow is not None, "is_own_profile": False}
+    return {"is_following": is_following, "is_own_profile": False}
 
 
-@router.get("/{user_id}", response_model=UserResponse)
+@router.get("/{user_id}", response_model=UserProfileResponse)
 async def get_user(
     user_id: UUID,
+    include_follow_status: bool = Query(False, description="Also return whether the current user follows this user"),
     current_user: Optional[User] = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -376,17 +360,34 @@ async def get_user(
     Get user profile by ID.
     
     Optionally authenticated - returns user profile whether authenticated or not.
+    With include_follow_status and a logged-in viewer, is_following and
+    is_own_profile are filled in from the same query, saving the separate
+    follow-status call.
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    with_follow_status = include_follow_status and current_user is not None
+    query = select(User).options(raiseload('*')).where(User.id == user_id)
+    if with_follow_status:
+        query = query.add_columns(
+            select(Follow.id).where(
+                Follow.follower_id == current_user.id,
+                Follow.following_id == User.id
+            ).exists().label('is_following')
+        )
+    result = await db.execute(query)
+    row = result.one_or_none()
     
-    if not user:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found"
         )
     
-    return user
+    profile = UserProfileResponse.model_validate(row[0])
+    if with_follow_status:
+        profile.is_own_profile = user_id == current_user.id
+        profile.is_following = row.is_following and not profile.is_own_profile
+    
+    return profile
 
 
 @router.put("/me", response_model=UserResponse)
@@ -406,86 +407,61 @@ async def update_current_user(
     
     await db.commit()
     await db.refresh(current_user)
+    invalidate_activity_feed_cache()
     
     return current_user
 
 
+# Built once and run with a user_id parameter. Counters come from the
+# trigger-maintained user_stats row; a user with no activity has no row yet,
+# hence the outer join. Distinct venues can't be kept incrementally, so that
+# one stays a scalar subquery.
+_USER_STATS_QUERY = (
+    select(
+        User.id,
+        UserStatsRow.sets_logged,
+        UserStatsRow.reviews_written,
+        UserStatsRow.lists_created,
+        (UserStatsRow.rating_sum / func.nullif(UserStatsRow.rating_count, 0)).label('average_rating'),
+        UserStatsRow.following_count,
+        UserStatsRow.followers_count,
+        func.round(cast(UserStatsRow.minutes_listened, Numeric) / 60, 1).label('hours_listened'),
+        # Count distinct venues attended (from events user has confirmed attendance)
+        select(func.count(func.distinct(Event.venue_location)))
+        .select_from(EventConfirmation)
+        .join(Event, EventConfirmation.event_id == Event.id)
+        .where(EventConfirmation.user_id == bindparam("user_id"))
+        .where(Event.venue_location.isnot(None))
+        .where(Event.venue_location != '')
+        .scalar_subquery().label('venues_attended'),
+    )
+    .outerjoin(UserStatsRow, UserStatsRow.user_id == User.id)
+    .where(User.id == bindparam("user_id"))
+)
+
+
 @router.get("/{user_id}/stats", response_model=UserStats)
 async def get_user_stats(
     user_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """Get user statistics."""
-    # Check if user exists
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    stats = (await db.execute(_USER_STATS_QUERY, {"user_id": user_id})).first()
     
-    if not user:
+    if not stats:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found"
         )
     
-    # Count sets logged
-    sets_logged_result = await db.execute(
-        select(func.count(UserSetLog.id)).where(UserSetLog.user_id == user_id)
-    )
-    sets_logged = sets_logged_result.scalar() or 0
-    
-    # Count reviews written
-    reviews_result = await db.execute(
-        select(func.count(Review.id)).where(Review.user_id == user_id)
-    )
-    reviews_written = reviews_result.scalar() or 0
-    
-    # Count lists created
-    lists_result = await db.execute(
-        select(func.count(List.id)).where(List.user_id == user_id)
-    )
-    lists_created = lists_result.scalar() or 0
-    
-    # Calculate average rating
-    avg_rating_result = await db.execute(
-        select(func.avg(Rating.rating)).where(Rating.user_id == user_id)
-    )
-    average_rating = avg_rating_result.scalar()
-    
-    # Count following
-    following_result = await db.execute(
-        select(func.count(Follow.id)).where(Follow.follower_id == user_id)
-    )
-    following_count = following_result.scalar() or 0
-    
-    # Count followers
-    followers_result = await db.execute(
-        select(func.count(Follow.id)).where(Follow.following_id == user_id)
-    )
-    followers_count = followers_result.scalar() or 0
-    
-    # Calculate total hours listened (from all logged sets, both live and listened)
-    # Join UserSetLog with DJSet to get duration_minutes
-    hours_result = await db.execute(
-        select(func.sum(DJSet.duration_minutes))
-        .select_from(UserSetLog)
-        .join(DJSet, UserSetLog.set_id == DJSet.id)
-        .where(UserSetLog.user_id == user_id)
-        .where(DJSet.duration_minutes.isnot(None))
-    )
-    total_minutes = hours_result.scalar()
-    if total_minutes is None:
-        total_minutes = 0
-    hours_listened = round(total_minutes / 60.0, 1) if total_minutes > 0 else 0.0
-    
-    # Count distinct venues attended (from events user has confirmed attendance)
-    venues_result = await db.execute(
-        select(func.count(func.distinct(Event.venue_location)))
-        .select_from(EventConfirmation)
-        .join(Event, EventConfirmation.event_id == Event.id)
-        .where(EventConfirmation.user_id == user_id)
-        .where(Event.venue_location.isnot(None))
-        .where(Event.venue_location != '')
-    )
-    venues_attended = venues_result.scalar() or 0
+    sets_logged = stats.sets_logged or 0
+    reviews_written = stats.reviews_written or 0
+    lists_created = stats.lists_created or 0
+    average_rating = stats.average_rating
+    following_count = stats.following_count or 0
+    followers_count = stats.followers_count or 0
+    venues_attended = stats.venues_attended or 0
+    hours_listened = float(stats.hours_listened or 0.0)
     
     return UserStats(
         sets_logged=sets_logged,
@@ -513,24 +489,25 @@ async def follow_user(
             detail="Cannot follow yourself"
         )
     
-    # Check if user exists
-    result = await db.execute(select(User).where(User.id == user_id))
-    target_user = result.scalar_one_or_none()
+    # Check the target user exists and whether we already follow them in one round trip
+    checks = await db.execute(
+        select(
+            select(User.id).where(User.id == user_id).exists(),
+            select(Follow.id).where(
+                Follow.follower_id == current_user.id,
+                Follow.following_id == user_id
+            ).exists()
+        )
+    )
+    user_exists, already_following = checks.one()
     
-    if not target_user:
+    if not user_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found"
         )
     
-    # Check if already following
-    existing_follow = await db.execute(
-        select(Follow).where(
-            Follow.follower_id == current_user.id,
-            Follow.following_id == user_id
-        )
-    )
-    if existing_follow.scalar_one_or_none():
+    if already_following:
         raise DuplicateEntryError("Already following this user")
     
     # Create follow relationship
@@ -540,10 +517,57 @@ async def follow_user(
     )
     db.add(follow)
     await db.commit()
+    invalidate_activity_feed_cache()
     
     return {"message": "Successfully followed user"}
 
 
+@router.post("/follow-batch", status_code=status.HTTP_201_CREATED)
+async def follow_users_batch(
+    follow_data: FollowBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Follow several users at once. Users already followed are skipped."""
+    # Dedupe while keeping the client's order for error reporting
+    user_ids = list(dict.fromkeys(follow_data.user_ids))
+    
+    if current_user.id in user_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot follow yourself"
+        )
+    
+    # Check every target exists in one round trip
+    result = await db.execute(select(User.id).where(User.id.in_(user_ids)))
+    existing_ids = set(result.scalars().all())
+    missing_ids = [user_id for user_id in user_ids if user_id not in existing_ids]
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {missing_ids[0]} not found"
+        )
+    
+    # One multi-row insert; uq_follow turns existing follows into no-ops
+    result = await db.execute(
+        pg_insert(Follow)
+        .values([
+            {'follower_id': current_user.id, 'following_id': user_id}
+            for user_id in user_ids
+        ])
+        .on_conflict_do_nothing(index_elements=['follower_id', 'following_id'])
+        .returning(Follow.following_id)
+    )
+    followed_count = len(result.all())
+    await db.commit()
+    invalidate_activity_feed_cache()
+    
+    return {
+        "message": f"Successfully followed {followed_count} users",
+        "followed_count": followed_count
+    }
+
+
 @router.delete("/{user_id}/follow", status_code=status.HTTP_204_NO_CONTENT)
 async def unfollow_user(
     user_id: UUID,
@@ -551,27 +575,72 @@ async def unfollow_user(
     db: AsyncSession = Depends(get_db)
 ):
     """Unfollow a user."""
-    # Find follow relationship
+    # Delete the follow relationship directly; uq_follow guarantees at most one row
     result = await db.execute(
-        select(Follow).where(
+        delete(Follow).where(
             Follow.follower_id == current_user.id,
             Follow.following_id == user_id
-        )
+        ).returning(Follow.id)
     )
-    follow = result.scalar_one_or_none()
     
-    if not follow:
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Not following this user"
         )
     
-    await db.delete(follow)
     await db.commit()
+    invalidate_activity_feed_cache()
     
     return None
 
 
+async def fetch_top_tracks_for_users(
+    db: AsyncSession,
+    user_ids: list[UUID]
+) -> dict[UUID, list[TrackResponse]]:
+    """
+    Load the top 5 tracks of each given user, with rating stats, in one query.
+    
+    Returns user_id -> tracks ordered by order (1-5); users without top
+    tracks are left out.
+    """
+    if not user_ids:
+        return {}
+    
+    query = (
+        select(
+            UserTopTrack.user_id,
+            Track,
+            UserTopTrack.order,
+            func.avg(TrackRating.rating).label('avg_rating'),
+            func.count(TrackRating.id).label('rating_count')
+        )
+        .options(raiseload('*'))
+        .join(UserTopTrack, Track.id == UserTopTrack.track_id)
+        .outerjoin(TrackRating, TrackRating.track_id == Track.id)
+        .where(UserTopTrack.user_id.in_(user_ids))
+        .group_by(UserTopTrack.user_id, Track.id, UserTopTrack.order)
+        .order_by(UserTopTrack.user_id, UserTopTrack.order.asc())
+    )
+    result = await db.execute(query)
+    
+    top_tracks = {}
+    for user_id, track, order, avg_rating, rating_count in result.all():
+        user_top_tracks = top_tracks.setdefault(user_id, [])
+        if len(user_top_tracks) >= 5:
+            continue
+        # Columns come straight from the database, so skip re-validating them
+        track_dict = {column: getattr(track, column) for column in TRACK_RESPONSE_COLUMNS}
+        track_dict['average_rating'] = float(avg_rating) if avg_rating else None
+        track_dict['rating_count'] = rating_count
+        track_dict['is_top_track'] = True
+        track_dict['top_track_order'] = order
+        user_top_tracks.append(TrackResponse.model_construct(**track_dict))
+    
+    return top_tracks
+
+
 @router.get("/{user_id}/top-tracks", response_model=list)
 async def get_user_top_tracks(
     user_id: UUID,
@@ -592,43 +661,8 @@ async def get_user_top_tracks(
             detail=f"User with ID {user_id} not found"
         )
     
-    # Get top tracks ordered by order
-    query = (
-        select(Track, UserTopTrack.order)
-        .join(UserTopTrack, Track.id == UserTopTrack.track_id)
-        .where(UserTopTrack.user_id == user_id)
-        .order_by(UserTopTrack.order.asc())
-        .limit(5)
-    )
-    
-    result = await db.execute(query)
-    tracks_with_order = result.all()
-    
-    # Load relationships and convert to response schemas
-    top_tracks = []
-    for track, order in tracks_with_order:
-        # Get rating stats
-        from app.models import TrackRating
-        rating_query = (
-            select(
-                func.avg(TrackRating.rating).label('avg_rating'),
-                func.count(TrackRating.id).label('rating_count')
-            )
-            .where(TrackRating.track_id == track.id)
-        )
-        rating_result = await db.execute(rating_query)
-        rating_row = rating_result.first()
-        avg_rating = rating_row[0] if rating_row else None
-        rating_count = rating_row[1] if rating_row else 0
-        
-        track_dict = TrackResponse.model_validate(track).model_dump()
-        track_dict['average_rating'] = float(avg_rating) if avg_rating else None
-        track_dict['rating_count'] = rating_count
-        track_dict['is_top_track'] = True
-        track_dict['top_track_order'] = order
-        top_tracks.append(track_dict)
-    
-    return top_tracks
+    top_tracks = await fetch_top_tracks_for_users(db, [user_id])
+    return top_tracks.get(user_id, [])
 
 
 @router.get("/{user_id}/top-events", response_model=list)
@@ -643,6 +677,7 @@ async def get_user_top_events(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     query = (
         select(Event, UserTopEvent.order)
+        .options(raiseload('*'))
         .join(UserTopEvent, Event.id == UserTopEvent.event_id)
         .where(UserTopEvent.user_id == user_id)
         .order_by(UserTopEvent.order.asc())
@@ -668,6 +703,7 @@ async def get_user_top_venues(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     query = (
         select(Venue, UserTopVenue.order, UserTopVenue.id.label("user_top_venue_id"))
+        .options(raiseload('*'))
         .join(UserTopVenue, Venue.id == UserTopVenue.venue_id)
         .where(UserTopVenue.user_id == user_id)
         .order_by(UserTopVenue.order.asc())
@@ -785,33 +821,30 @@ async def get_my_friends(
     
     Returns paginated list of friends with their user information.
     """
-    # Get list of followed user IDs
-    following_result = await db.execute(
-        select(Follow.following_id).where(Follow.follower_id == current_user.id)
-    )
-    following_ids = [row[0] for row in following_result.all()]
-    
-    if not following_ids:
-        return PaginatedResponse(
-            items=[],
-            total=0,
-            page=page,
-            limit=limit,
-            pages=0
-        )
-    
-    # Get total count
-    total = len(following_ids)
-    
-    # Apply pagination
+    # Page through followed users in SQL; COUNT(*) OVER () carries the total
     offset = (page - 1) * limit
-    paginated_ids = following_ids[offset:offset + limit]
-    
-    # Get user objects
     users_result = await db.execute(
-        select(User).where(User.id.in_(paginated_ids))
+        select(User, func.count().over().label('total'))
+        .options(raiseload('*'))
+        .join(Follow, Follow.following_id == User.id)
+        .where(Follow.follower_id == current_user.id)
+        .order_by(User.username)
+        .offset(offset)
+        .limit(limit)
     )
-    users = users_result.scalars().all()
+    rows = users_result.all()
+    users = [user for user, _ in rows]
+    
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        # Past the last page there are no rows to carry the window total
+        count_result = await db.execute(
+            select(func.count(Follow.id)).where(Follow.follower_id == current_user.id)
+        )
+        total = count_result.scalar() or 0
+    else:
+        total = 0
     
     # Calculate pages
     pages = (total + limit - 1) // limit if total > 0 else 0
@@ -840,6 +873,6 @@ async def get_user_feed(
     
     This is a convenience endpoint that calls activity-feed with friends_only=True.
     """
-    return await get_activity_feed(page=page, limit=limit, friends_only=True, current_user=current_user, db=db)
+    return await get_activity_feed(page=page, limit=limit, friends_only=True, current_user_id=current_user.id, db=db)
 
 
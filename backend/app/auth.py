@@ -8,13 +8,14 @@ This module provides:
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException, Security, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
 from jose import JWTError, jwt
 import bcrypt
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
@@ -26,6 +27,29 @@ from app.core.exceptions import UnauthorizedError
 # This tells FastAPI to look for the token in the Authorization header
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# Bearer scheme for endpoints that work with or without a logged-in user
+optional_bearer = HTTPBearer(auto_error=False)
+
+# Token decode settings, built once. Our tokens only carry "sub" and "exp", so
+# the claims we never issue are not checked; signature and expiry always are.
+_JWT_ALGORITHMS = [settings.JWT_ALGORITHM]
+_JWT_DECODE_OPTIONS = {
+    "verify_aud": False,
+    "verify_iat": False,
+    "verify_nbf": False,
+    "verify_iss": False,
+    "verify_jti": False,
+    "verify_at_hash": False,
+}
+
+# LRU cache for validated optional-auth tokens: token -> (user_id, expires_at).
+# Only the id is kept; the user itself is loaded in each request's session.
+# The cache is per process, so revoking a token can't reach other workers
+# before the entry expires; the short TTL bounds that.
+_valid_token_cache: Dict[str, tuple[UUID, datetime]] = {}
+_VALID_TOKEN_CACHE_MAX_ENTRIES = 10000
+VALID_TOKEN_CACHE_TTL = timedelta(seconds=30)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -131,7 +155,8 @@ async def get_current_user(
         payload = jwt.decode(
             token,
             settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM]
+            algorithms=_JWT_ALGORITHMS,
+            options=_JWT_DECODE_OPTIONS
         )
         
         # Extract user_id from token
@@ -143,7 +168,6 @@ async def get_current_user(
         raise credentials_exception
     
     # Fetch user from database
-    from sqlalchemy import select
     result = await db.execute(select(User).where(User.id == UUID(user_id)))
     user = result.scalar_one_or_none()
     
@@ -174,3 +198,97 @@ async def get_current_active_user(
     return current_user
 
 
+def _decode_optional_token(token: str) -> Optional[dict]:
+    """
+    Decode a bearer token for the optional-auth dependencies.
+    
+    Returns the payload with "sub" parsed into "user_id", or None for an
+    invalid or malformed token so the request is treated as anonymous.
+    Cancellation and other errors propagate instead of being swallowed.
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.JWT_SECRET,
+            algorithms=_JWT_ALGORITHMS,
+            options=_JWT_DECODE_OPTIONS
+        )
+        
+        # Extract user_id from token
+        user_id: Optional[str] = payload.get("sub")
+        if user_id is None:
+            return None
+        payload["user_id"] = UUID(user_id)
+    except (JWTError, ValueError, TypeError, AttributeError, LookupError):
+        return None
+    
+    return payload
+
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(optional_bearer),
+    db: AsyncSession = Depends(get_db)
+) -> Optional[User]:
+    """
+    Optional dependency to get the current user if authenticated.
+    
+    Returns None for anonymous requests, invalid tokens and deleted users.
+    Every router depends on this one function so FastAPI resolves it once
+    per request. Validated tokens are cached per process for
+    VALID_TOKEN_CACHE_TTL, but the user is always loaded fresh.
+    """
+    if not credentials:
+        return None
+    
+    # Reuse a recently validated token to skip decoding it. Hits move to the
+    # end so the dict's insertion order tracks recency.
+    token = credentials.credentials
+    cached = _valid_token_cache.pop(token, None)
+    if cached and datetime.utcnow() < cached[1]:
+        user = await db.get(User, cached[0])
+        if user is not None:
+            _valid_token_cache[token] = cached
+        return user
+    
+    payload = _decode_optional_token(token)
+    if payload is None:
+        return None
+    user_uuid = payload["user_id"]
+    
+    # Fetch user from database
+    user = await db.get(User, user_uuid)
+    
+    if user is not None:
+        # Never keep a token cached past its own expiry
+        expires_at = datetime.utcnow() + VALID_TOKEN_CACHE_TTL
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, datetime.utcfromtimestamp(exp))
+        if len(_valid_token_cache) >= _VALID_TOKEN_CACHE_MAX_ENTRIES:
+            # Evict the least recently used token
+            del _valid_token_cache[next(iter(_valid_token_cache))]
+        _valid_token_cache[token] = (user_uuid, expires_at)
+    
+    return user
+
+
+async def get_optional_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(optional_bearer)
+) -> Optional[UUID]:
+    """
+    Optional dependency for endpoints that only need the caller's id.
+    
+    Like get_optional_user but never loads the user: the id comes from a
+    cached validated token or straight from the token's "sub" claim. The
+    user may have been deleted since the token was issued, so only use the
+    id in queries that tolerate that.
+    """
+    if not credentials:
+        return None
+    
+    cached = _valid_token_cache.get(credentials.credentials)
+    if cached and datetime.utcnow() < cached[1]:
+        return cached[0]
+    
+    payload = _decode_optional_token(credentials.credentials)
+    return payload["user_id"] if payload else None
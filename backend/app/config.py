@@ -19,6 +19,12 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20  # Persistent connections per worker process
+    DB_MAX_OVERFLOW: int = 20  # Extra connections allowed under burst load
+    DB_POOL_TIMEOUT: int = 10  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_USE_PGBOUNCER: bool = False  # Disable prepared statement caching for PgBouncer transaction mode
+    DB_QUERY_CACHE_SIZE: int = 1200  # Compiled SQL statements kept in SQLAlchemy's LRU cache
     
     # JWT Authentication
     JWT_SECRET: str
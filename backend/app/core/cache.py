@@ -0,0 +1,51 @@
+"""
+In-process response caches shared across routers.
+
+Each cache maps a key to (value, expires_at). Routers that serve a cached
+response read and fill it; routers whose writes change what it holds call
+its invalidate function. Invalidation only reaches this process, so every
+cache also has a short TTL bounding staleness from other workers.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+from uuid import UUID
+
+from app.schemas import SetTrackResponse, CursorPaginatedResponse
+
+# Cache for anonymous set track lists: set_id -> (responses, expires_at).
+# Writes in this process invalidate their set; the TTL also bounds staleness
+# from rating changes.
+set_tracks_cache: Dict[UUID, tuple[List[SetTrackResponse], datetime]] = {}
+SET_TRACKS_CACHE_MAX_ENTRIES = 1000
+SET_TRACKS_CACHE_TTL = timedelta(seconds=30)
+
+# Cache for anonymous discover pages: (search, artist_name, sort, order, page, limit, cursor)
+# -> (response, expires_at). Adding or linking tracks in this process clears it;
+# the TTL also bounds staleness from rating changes.
+discover_cache: Dict[tuple, tuple[CursorPaginatedResponse, datetime]] = {}
+DISCOVER_CACHE_MAX_ENTRIES = 500
+DISCOVER_CACHE_TTL = timedelta(seconds=30)
+
+# Cache for activity feed pages: (follower_id or None, page, limit) -> (response,
+# expires_at), where None is the everyone feed. Activity writes in this process
+# clear it; the TTL also bounds staleness from edits to the users, sets, tracks
+# and events embedded in items.
+activity_feed_cache: Dict[tuple, tuple[dict, datetime]] = {}
+ACTIVITY_FEED_CACHE_MAX_ENTRIES = 1000
+ACTIVITY_FEED_CACHE_TTL = timedelta(seconds=30)
+
+
+def invalidate_set_tracks_cache(set_id: UUID) -> None:
+    """Drop the cached anonymous track list for a set after a write."""
+    set_tracks_cache.pop(set_id, None)
+
+
+def invalidate_discover_cache() -> None:
+    """Drop every cached anonymous discover page after tracks are added or linked."""
+    discover_cache.clear()
+
+
+def invalidate_activity_feed_cache() -> None:
+    """Drop every cached activity feed page after activity or follows change."""
+    activity_feed_cache.clear()
@@ -0,0 +1,26 @@
+"""
+Track helpers shared across routers.
+"""
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+
+from app.models import Track
+from app.schemas import TrackResponse
+
+# Track columns copied into a TrackResponse; its stats fields are filled per request
+TRACK_RESPONSE_COLUMNS = tuple(
+    name for name in TrackResponse.model_fields if name in Track.__table__.c
+)
+
+
+async def ensure_track_exists(db: AsyncSession, track_id: UUID) -> None:
+    """Raise 404 if the track does not exist, without loading the full row."""
+    result = await db.execute(select(Track.id).where(Track.id == track_id).limit(1))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Track with ID {track_id} not found"
+        )
@@ -7,6 +7,7 @@ It provides a database session dependency that FastAPI routes can use.
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 
 # Create async engine
@@ -14,10 +15,24 @@ from app.config import settings
 # Note: We'll use psycopg (async) instead of psycopg2 for async operations
 database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
 
+# asyncpg's prepared statement cache is per connection, which breaks when
+# PgBouncer in transaction mode hands each transaction a different server connection
+connect_args = {}
+if settings.DB_USE_PGBOUNCER:
+    connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
 engine = create_async_engine(
     database_url,
     echo=True,  # Log SQL queries (set to False in production)
     future=True,
+    poolclass=AsyncAdaptedQueuePool,  # Pin the pooled class so sessions never fall back to NullPool
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,  # Drop connections closed by the server or a proxy
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,  # Room for every route's compiled statements (default is 500)
+    connect_args=connect_args,
 )
 
 # Create async session factory
@@ -11,7 +11,7 @@ from datetime import datetime
 from typing import List as _List, Optional
 from uuid import uuid4
 
-from sqlalchemy import String, Text, Boolean, Integer, Float, Date, DateTime, ForeignKey, Enum, UniqueConstraint, CheckConstraint, Numeric
+from sqlalchemy import String, Text, Boolean, Integer, Float, Date, DateTime, ForeignKey, Enum, UniqueConstraint, CheckConstraint, Numeric, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -109,6 +109,12 @@ class User(Base):
     top_tracks: Mapped["_List[UserTopTrack]"] = relationship("UserTopTrack", back_populates="user", cascade="all, delete-orphan")
     top_events: Mapped["_List[UserTopEvent]"] = relationship("UserTopEvent", back_populates="user", cascade="all, delete-orphan")
     top_venues: Mapped["_List[UserTopVenue]"] = relationship("UserTopVenue", back_populates="user", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Trigram indexes serve the substring (ILIKE '%...%') user search
+        Index('ix_users_username_trgm', 'username', postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'}),
+        Index('ix_users_display_name_trgm', 'display_name', postgresql_using='gin', postgresql_ops={'display_name': 'gin_trgm_ops'}),
+    )
 
 
 class DJSet(Base):
@@ -210,12 +216,14 @@ class SetTrack(Base):
     # Relationships
     set: Mapped["DJSet"] = relationship("DJSet", back_populates="track_tags")
     added_by: Mapped["User"] = relationship("User", foreign_keys=[added_by_id])
-    confirmations: Mapped["_List[TrackConfirmation]"] = relationship("TrackConfirmation", back_populates="track", cascade="all, delete-orphan")
+    confirmations: Mapped["_List[TrackConfirmation]"] = relationship("TrackConfirmation", back_populates="track", cascade="all, delete-orphan", passive_deletes=True)
     # Note: TrackRating and TrackReview now reference Track model, not SetTrack
     
     # Unique constraint: prevent duplicate track tags for same set
     __table_args__ = (
         UniqueConstraint('set_id', 'track_name', 'artist_name', name='uq_set_track'),
+        # Serves a set's track list in position order
+        Index('ix_set_tracks_set_id_position_created', 'set_id', 'position', 'created_at'),
     )
 
 
@@ -250,7 +258,7 @@ class Track(Base):
     created_by_id: Mapped[Optional[UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
@@ -260,6 +268,14 @@ class Track(Base):
     reviews: Mapped["_List[TrackReview]"] = relationship("TrackReview", back_populates="track", cascade="all, delete-orphan")
     user_top_tracks: Mapped["_List[UserTopTrack]"] = relationship("UserTopTrack", back_populates="track", cascade="all, delete-orphan")
     list_items: Mapped["_List[ListItem]"] = relationship("ListItem", back_populates="track", cascade="all, delete-orphan", foreign_keys="ListItem.track_id")
+    
+    __table_args__ = (
+        # Trigram indexes serve the substring (ILIKE '%...%') track search and artist filter
+        Index('ix_tracks_track_name_trgm', 'track_name', postgresql_using='gin', postgresql_ops={'track_name': 'gin_trgm_ops'}),
+        Index('ix_tracks_artist_name_trgm', 'artist_name', postgresql_using='gin', postgresql_ops={'artist_name': 'gin_trgm_ops'}),
+        # Serves created_at ordering and (created_at, id) keyset pagination in discover
+        Index('ix_tracks_created_at_id', 'created_at', 'id'),
+    )
 
 
 class TrackSetLink(Base):
@@ -288,11 +304,13 @@ class TrackSetLink(Base):
     track: Mapped["Track"] = relationship("Track", back_populates="set_links")
     set: Mapped["DJSet"] = relationship("DJSet", back_populates="track_links")
     added_by: Mapped["User"] = relationship("User", foreign_keys=[added_by_id])
-    confirmations: Mapped["_List[TrackConfirmation]"] = relationship("TrackConfirmation", foreign_keys="TrackConfirmation.track_set_link_id", back_populates="track_set_link", cascade="all, delete-orphan")
+    confirmations: Mapped["_List[TrackConfirmation]"] = relationship("TrackConfirmation", foreign_keys="TrackConfirmation.track_set_link_id", back_populates="track_set_link", cascade="all, delete-orphan", passive_deletes=True)
     
     # Unique constraint: prevent duplicate links
     __table_args__ = (
         UniqueConstraint('track_id', 'set_id', name='uq_track_set_link'),
+        # Serves a set's linked tracks in position order
+        Index('ix_track_set_links_set_id_position_created', 'set_id', 'position', 'created_at'),
     )
 
 
@@ -308,8 +326,8 @@ class TrackConfirmation(Base):
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     
     # Foreign keys - one of these must be set
-    track_id: Mapped[Optional[UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("set_tracks.id"), nullable=True, index=True)
-    track_set_link_id: Mapped[Optional[UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("track_set_links.id"), nullable=True, index=True)
+    track_id: Mapped[Optional[UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("set_tracks.id", ondelete="CASCADE"), nullable=True, index=True)
+    track_set_link_id: Mapped[Optional[UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("track_set_links.id", ondelete="CASCADE"), nullable=True, index=True)
     user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     
     # Confirmation status: True = confirmed (correct), False = denied (incorrect)
@@ -546,8 +564,11 @@ class TrackRating(Base):
     track: Mapped["Track"] = relationship("Track", back_populates="ratings")
     
     # Unique constraint: one rating per user per track
+    # (also serves the per-user rating lookups by user_id + track_id)
     __table_args__ = (
         UniqueConstraint('user_id', 'track_id', name='uq_user_track_rating'),
+        # Covers per-track rating stats (average, count, distribution) as an index-only scan
+        Index('ix_track_ratings_track_id_rating', 'track_id', 'rating'),
     )
 
 
@@ -582,6 +603,8 @@ class TrackReview(Base):
     # Unique constraint: one review per user per track
     __table_args__ = (
         UniqueConstraint('user_id', 'track_id', name='uq_user_track_review'),
+        # Serves the public review list for a track, already ordered by newest first
+        Index('ix_track_reviews_track_id_public_created', 'track_id', 'is_public', 'created_at'),
     )
 
 
@@ -690,6 +713,64 @@ class Follow(Base):
     )
 
 
+class UserStatsRow(Base):
+    """
+    User Stats model - denormalized profile counters, one row per user.
+
+    Rows are maintained by database triggers on user_set_logs, reviews,
+    lists, ratings, follows and dj_sets (see the add_user_stats_table
+    migration), so the app only ever reads this table. A missing row means
+    the user has no activity yet.
+    """
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    # Counters
+    sets_logged: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reviews_written: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    lists_created: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    following_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    followers_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Running sum/count pair so the average rating needs no scan
+    rating_sum: Mapped[float] = mapped_column(Float, default=0, nullable=False)
+    rating_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Total duration of logged sets with a known length
+    minutes_listened: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class Activity(Base):
+    """
+    Activity model - denormalized activity feed, one row per feed entry.
+
+    Rows are maintained by database triggers on reviews, ratings,
+    track_reviews, track_ratings, user_top_tracks, user_set_logs, events and
+    event_confirmations (see the add_activities_table migration), so the app
+    only ever reads this table. Private reviews and logs that aren't top sets
+    have no row.
+    """
+    __tablename__ = "activities"
+
+    # The activity type and the id of the row it points at
+    activity_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    source_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+
+    # The user the activity is shown under
+    user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    # Copied from the source row
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    # Everyone's feed scans created_at, with the primary key as tiebreaker;
+    # friends feeds scan per followed user
+    __table_args__ = (
+        Index('ix_activities_created_at_key', 'created_at', 'activity_type', 'source_id'),
+        Index('ix_activities_user_id_created_at', 'user_id', 'created_at'),
+    )
+
+
 class Event(Base):
     """
     Event model - stores live event information.
@@ -64,6 +64,12 @@ class UserResponse(UserBase):
     # Note: hashed_password is NOT included - security!
 
 
+class UserProfileResponse(UserResponse):
+    """User profile, with the viewer's follow status when it was requested."""
+    is_following: Optional[bool] = None
+    is_own_profile: Optional[bool] = None
+
+
 # ============================================================================
 # DJ SET SCHEMAS
 # ============================================================================
@@ -469,6 +475,11 @@ class ListResponse(BaseSchema):
 # FOLLOW SCHEMAS
 # ============================================================================
 
+class FollowBatchCreate(BaseSchema):
+    """Schema for following several users at once."""
+    user_ids: List[UUID] = Field(..., min_length=1, max_length=100)
+
+
 class FollowResponse(BaseSchema):
     """Schema for follow relationship."""
     id: UUID
@@ -525,6 +536,18 @@ class PaginatedResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CursorPaginatedResponse(PaginatedResponse):
+    """
+    Paginated response that can also be continued with a keyset cursor.
+    
+    next_cursor is set when another page may follow. Pages fetched with a
+    cursor skip counting, so total and pages are None for them.
+    """
+    total: Optional[int] = None
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
 # ============================================================================
 # ACTIVITY FEED SCHEMAS
 # ============================================================================
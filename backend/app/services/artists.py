@@ -0,0 +1,58 @@
+"""
+Artist helpers shared by the routes that import tracks.
+
+Artists are auto-created from Spotify data when tracks are imported.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.models import Artist
+from app.services.spotify_search import get_artists_batch
+
+
+async def ensure_artists_from_spotify(
+    artist_ids: List[str],
+    db: AsyncSession,
+) -> List[Artist]:
+    """
+    Given a list of Spotify artist IDs, ensure each has an Artist row.
+    Fetches missing artists from Spotify API and creates them.
+    Returns the list of Artist objects.
+    """
+    if not artist_ids:
+        return []
+
+    # Find which already exist
+    existing_result = await db.execute(
+        select(Artist).where(Artist.spotify_artist_id.in_(artist_ids))
+    )
+    existing = {a.spotify_artist_id: a for a in existing_result.scalars().all()}
+
+    missing_ids = [aid for aid in artist_ids if aid not in existing]
+    if not missing_ids:
+        return list(existing.values())
+
+    # Fetch missing from Spotify
+    spotify_artists = await get_artists_batch(missing_ids)
+
+    new_artists = []
+    for sa in spotify_artists:
+        if sa["spotify_artist_id"] in existing:
+            continue
+        artist = Artist(
+            name=sa["name"],
+            spotify_artist_id=sa["spotify_artist_id"],
+            spotify_url=sa.get("spotify_url"),
+            image_url=sa.get("image_url"),
+            genres=sa.get("genres"),
+        )
+        db.add(artist)
+        new_artists.append(artist)
+        existing[sa["spotify_artist_id"]] = artist
+
+    if new_artists:
+        await db.flush()
+
+    return list(existing.values())
@@ -0,0 +1,109 @@
+"""
+Verify the trigger-maintained user_stats counters against live aggregates.
+
+Recomputes every user's counters from user_set_logs, reviews, lists,
+follows, ratings and dj_sets (what the stats endpoint used to aggregate per
+request) and reports users whose user_stats row has drifted. A missing row
+counts as all zeros. With --repair, drifted rows are overwritten with the
+recomputed values.
+
+Usage: python -m scripts.verify_user_stats [--repair]
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.database import AsyncSessionLocal
+from app.models import User, UserSetLog, Review, List, Follow, Rating, DJSet, UserStatsRow
+
+COUNTERS = (
+    "sets_logged",
+    "reviews_written",
+    "lists_created",
+    "following_count",
+    "followers_count",
+    "rating_sum",
+    "rating_count",
+    "minutes_listened",
+)
+
+
+def _expected_stats_query():
+    """Per-user counters computed from the source tables."""
+    def count(model, column):
+        return (
+            select(func.count()).select_from(model).where(column == User.id)
+            .scalar_subquery()
+        )
+
+    return select(
+        User.id,
+        count(UserSetLog, UserSetLog.user_id).label("sets_logged"),
+        count(Review, Review.user_id).label("reviews_written"),
+        count(List, List.user_id).label("lists_created"),
+        count(Follow, Follow.follower_id).label("following_count"),
+        count(Follow, Follow.following_id).label("followers_count"),
+        select(func.coalesce(func.sum(Rating.rating), 0)).where(Rating.user_id == User.id)
+        .scalar_subquery().label("rating_sum"),
+        count(Rating, Rating.user_id).label("rating_count"),
+        select(func.coalesce(func.sum(DJSet.duration_minutes), 0))
+        .select_from(UserSetLog).join(DJSet, DJSet.id == UserSetLog.set_id)
+        .where(UserSetLog.user_id == User.id)
+        .scalar_subquery().label("minutes_listened"),
+    )
+
+
+def _matches(expected, stored) -> bool:
+    """Compare one user's recomputed counters with their stored row."""
+    for name in COUNTERS:
+        actual = getattr(stored, name) if stored else 0
+        if name == "rating_sum":
+            if abs(float(getattr(expected, name)) - float(actual)) > 1e-6:
+                return False
+        elif getattr(expected, name) != actual:
+            return False
+    return True
+
+
+async def verify(repair: bool = False) -> int:
+    async with AsyncSessionLocal() as db:
+        expected_rows = (await db.execute(_expected_stats_query())).all()
+        stored_result = await db.execute(select(UserStatsRow))
+        stored_by_user = {row.user_id: row for row in stored_result.scalars().all()}
+
+        drifted = [row for row in expected_rows if not _matches(row, stored_by_user.get(row.id))]
+        print(f"Checked {len(expected_rows)} users, {len(drifted)} drifted")
+
+        for row in drifted:
+            stored = stored_by_user.get(row.id)
+            changes = ", ".join(
+                f"{name} {getattr(stored, name) if stored else 0} -> {getattr(row, name)}"
+                for name in COUNTERS
+                if (getattr(stored, name) if stored else 0) != getattr(row, name)
+            )
+            print(f"  {row.id}: {changes}")
+
+        if repair and drifted:
+            values = [
+                {"user_id": row.id, **{name: getattr(row, name) for name in COUNTERS}}
+                for row in drifted
+            ]
+            statement = pg_insert(UserStatsRow).values(values)
+            await db.execute(statement.on_conflict_do_update(
+                index_elements=[UserStatsRow.user_id],
+                set_={name: getattr(statement.excluded, name) for name in COUNTERS},
+            ))
+            await db.commit()
+            print(f"Repaired {len(drifted)} users")
+
+        return len(drifted)
+
+
+if __name__ == "__main__":
+    drifted = asyncio.run(verify(repair="--repair" in sys.argv[1:]))
+    sys.exit(1 if drifted and "--repair" not in sys.argv[1:] else 0)
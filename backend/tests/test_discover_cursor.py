@@ -0,0 +1,144 @@
+"""
+Tests for cursor pagination on track discovery.
+
+GET /api/tracks accepts the next_cursor of a created_at page to continue
+after it with a keyset condition instead of an offset. Cursor pages ignore
+page and are not counted, so total and pages are null.
+"""
+
+import base64
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.main import app
+from app.auth import get_optional_user
+from app.database import get_db
+from app.api.tracks import _encode_discover_cursor, _decode_discover_cursor
+from app.core.cache import invalidate_discover_cache
+
+
+class _EmptyStream:
+    """Async result with no rows, standing in for db.stream."""
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+class TestDiscoverCursorEncoding:
+    """Tests for the opaque discover cursor."""
+
+    def test_cursor_round_trip(self):
+        """
+        Tests that decoding an encoded cursor returns the same position.
+        """
+        created_at = datetime(2026, 10, 16, 12, 30, 45, 123456)
+        track_id = uuid4()
+
+        cursor = _encode_discover_cursor(created_at, track_id)
+
+        assert _decode_discover_cursor(cursor) == (created_at, track_id)
+
+    @pytest.mark.parametrize("cursor", [
+        "",
+        "not a cursor",
+        base64.urlsafe_b64encode(b"no separator").decode(),
+        base64.urlsafe_b64encode(b"2026-10-16T12:00:00|not-a-uuid").decode(),
+        base64.urlsafe_b64encode(f"yesterday|{uuid4()}".encode()).decode(),
+        base64.urlsafe_b64encode(b"\xff\xfe|\xff").decode(),
+    ])
+    def test_malformed_cursor_raises_value_error(self, cursor):
+        """
+        Tests that every kind of malformed cursor raises ValueError.
+        """
+        with pytest.raises(ValueError):
+            _decode_discover_cursor(cursor)
+
+
+class TestDiscoverCursorEndpoint:
+    """Tests for GET /api/tracks with a cursor and a mocked database session."""
+
+    def setup_method(self):
+        """Override auth and the database session for each test."""
+        invalidate_discover_cache()
+        self.db = MagicMock()
+        self.db.stream = AsyncMock(return_value=_EmptyStream())
+        self.db.execute = AsyncMock()
+
+        async def override_db():
+            yield self.db
+
+        app.dependency_overrides[get_optional_user] = lambda: None
+        app.dependency_overrides[get_db] = override_db
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Remove the dependency overrides and anything cached."""
+        app.dependency_overrides.clear()
+        invalidate_discover_cache()
+
+    def _streamed_sql(self, call_index: int) -> str:
+        query = self.db.stream.call_args_list[call_index].args[0]
+        return str(query.compile(dialect=postgresql.dialect()))
+
+    def test_malformed_cursor_returns_400(self):
+        """
+        Tests that a malformed cursor is a client error rather than a 500.
+        """
+        response = self.client.get("/api/tracks", params={"cursor": "not a cursor"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+        self.db.stream.assert_not_called()
+
+    def test_cursor_with_other_sort_returns_400(self):
+        """
+        Tests that cursors are only accepted for the created_at sort.
+        """
+        cursor = _encode_discover_cursor(datetime.utcnow(), uuid4())
+
+        response = self.client.get("/api/tracks", params={"cursor": cursor, "sort": "track_name"})
+
+        assert response.status_code == 400
+        self.db.stream.assert_not_called()
+
+    def test_cursor_page_ignores_page_and_is_not_counted(self):
+        """
+        Tests that with a cursor the page argument has no effect on the query
+        and total and pages come back null.
+        """
+        cursor = _encode_discover_cursor(datetime.utcnow(), uuid4())
+
+        first = self.client.get("/api/tracks", params={"cursor": cursor, "page": 1})
+        later = self.client.get("/api/tracks", params={"cursor": cursor, "page": 5})
+
+        assert first.status_code == 200
+        assert later.status_code == 200
+        for data in (first.json(), later.json()):
+            assert data["total"] is None
+            assert data["pages"] is None
+            assert data["next_cursor"] is None
+
+        first_sql, later_sql = self._streamed_sql(0), self._streamed_sql(1)
+        assert first_sql == later_sql
+        assert "OFFSET" not in first_sql
+        assert "count(*) OVER ()" not in first_sql
+        # A page past the end isn't recounted for keyset pages either
+        self.db.execute.assert_not_called()
+
+    def test_offset_page_is_counted(self):
+        """
+        Tests that without a cursor the page is offset and counted as before.
+        """
+        response = self.client.get("/api/tracks", params={"page": 1})
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 0
+        assert response.json()["pages"] == 0
+        assert "count(*) OVER ()" in self._streamed_sql(0)
@@ -0,0 +1,142 @@
+"""
+Tests for the batch follow endpoint.
+
+POST /api/users/follow-batch follows several users in one request: the
+caller can't follow themselves, every target must exist, and users that are
+already followed are skipped by the insert's ON CONFLICT DO NOTHING.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from app.main import app
+from app.auth import get_current_active_user
+from app.database import get_db
+from app.schemas import FollowBatchCreate
+
+
+def _result(scalars=None, rows=None):
+    """Build a mock query result for db.execute."""
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = scalars or []
+    result.all.return_value = rows or []
+    return result
+
+
+class TestFollowBatchEndpoint:
+    """Tests for POST /api/users/follow-batch with a mocked database session."""
+
+    def setup_method(self):
+        """Override auth and the database session for each test."""
+        self.current_user = MagicMock()
+        self.current_user.id = uuid4()
+        self.db = MagicMock()
+        self.db.execute = AsyncMock()
+        self.db.commit = AsyncMock()
+
+        async def override_db():
+            yield self.db
+
+        app.dependency_overrides[get_current_active_user] = lambda: self.current_user
+        app.dependency_overrides[get_db] = override_db
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Remove the dependency overrides."""
+        app.dependency_overrides.clear()
+
+    def test_self_follow_rejected(self):
+        """
+        Tests that including the caller's own id is rejected before any query runs.
+        """
+        response = self.client.post(
+            "/api/users/follow-batch",
+            json={"user_ids": [str(uuid4()), str(self.current_user.id)]}
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Cannot follow yourself"
+        self.db.execute.assert_not_called()
+        self.db.commit.assert_not_called()
+
+    def test_unknown_user_returns_404(self):
+        """
+        Tests that an id with no matching user fails the whole batch with a 404.
+        """
+        known_id, unknown_id = uuid4(), uuid4()
+        self.db.execute.side_effect = [_result(scalars=[known_id])]
+
+        response = self.client.post(
+            "/api/users/follow-batch",
+            json={"user_ids": [str(known_id), str(unknown_id)]}
+        )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == f"User with ID {unknown_id} not found"
+        assert self.db.execute.call_count == 1
+        self.db.commit.assert_not_called()
+
+    def test_already_followed_users_are_skipped(self):
+        """
+        Tests that the insert ignores existing follows and only counts new ones.
+        """
+        new_id, followed_id = uuid4(), uuid4()
+        self.db.execute.side_effect = [
+            _result(scalars=[new_id, followed_id]),
+            # ON CONFLICT DO NOTHING returns only the rows it inserted
+            _result(rows=[(new_id,)]),
+        ]
+
+        response = self.client.post(
+            "/api/users/follow-batch",
+            json={"user_ids": [str(new_id), str(followed_id), str(new_id)]}
+        )
+
+        assert response.status_code == 201
+        assert response.json()["followed_count"] == 1
+        self.db.commit.assert_awaited_once()
+
+        insert_statement = self.db.execute.call_args_list[1].args[0]
+        compiled = insert_statement.compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (follower_id, following_id) DO NOTHING" in str(compiled)
+        # Duplicate ids in the request are inserted once
+        following_ids = [value for key, value in compiled.params.items() if key.startswith("following_id")]
+        assert following_ids == [new_id, followed_id]
+
+    def test_empty_and_oversized_batches_rejected(self):
+        """
+        Tests that the endpoint validates the 1-100 id bound before touching the database.
+        """
+        empty = self.client.post("/api/users/follow-batch", json={"user_ids": []})
+        oversized = self.client.post(
+            "/api/users/follow-batch",
+            json={"user_ids": [str(uuid4()) for _ in range(101)]}
+        )
+
+        assert empty.status_code == 422
+        assert oversized.status_code == 422
+        self.db.execute.assert_not_called()
+
+
+class TestFollowBatchSchema:
+    """Tests for the FollowBatchCreate request schema."""
+
+    def test_accepts_one_to_one_hundred_ids(self):
+        """
+        Tests that batches at both ends of the bound validate.
+        """
+        assert len(FollowBatchCreate(user_ids=[uuid4()]).user_ids) == 1
+        assert len(FollowBatchCreate(user_ids=[uuid4() for _ in range(100)]).user_ids) == 100
+
+    def test_rejects_empty_and_oversized_batches(self):
+        """
+        Tests that an empty batch and one over 100 ids fail validation.
+        """
+        with pytest.raises(ValidationError):
+            FollowBatchCreate(user_ids=[])
+        with pytest.raises(ValidationError):
+            FollowBatchCreate(user_ids=[uuid4() for _ in range(101)])
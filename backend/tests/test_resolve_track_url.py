@@ -0,0 +1,90 @@
+"""
+Tests for matching a resolved track URL against existing tracks.
+
+GET /api/tracks/resolve-url looks an upstream track up by its URL or its
+platform ID in one query. When both match different tracks, the URL match
+must win, including over a track whose URL column is NULL (which Postgres
+sorts first under a plain DESC).
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.main import app
+from app.auth import get_optional_user
+from app.database import get_db
+from app.api import track_search
+
+
+class TestResolveTrackUrlMatching:
+    """Tests for the existing-track lookup in resolve-url with a mocked database session."""
+
+    def setup_method(self):
+        """Override auth and the database session for each test."""
+        track_search._upstream_cache.clear()
+        self.db = MagicMock()
+        self.db.execute = AsyncMock()
+
+        async def override_db():
+            yield self.db
+
+        app.dependency_overrides[get_optional_user] = lambda: None
+        app.dependency_overrides[get_db] = override_db
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Remove the dependency overrides and anything cached."""
+        app.dependency_overrides.clear()
+        track_search._upstream_cache.clear()
+
+    def test_url_match_ranks_ahead_of_id_only_match(self):
+        """
+        Tests that with one track matching the URL and another matching only
+        the platform ID (with a NULL URL), the lookup orders the URL match
+        first with NULL comparisons treated as no match.
+        """
+        url = "https://soundcloud.com/artist/track"
+        url_match_id = uuid4()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = url_match_id
+        self.db.execute.return_value = result
+
+        with patch.object(track_search.soundcloud_search, "resolve_soundcloud_url", AsyncMock(return_value={
+            "id": 123,
+            "kind": "track",
+            "soundcloud_url": url,
+            "duration_ms": 200000,
+        })):
+            response = self.client.get("/api/tracks/resolve-url", params={"url": url})
+
+        assert response.status_code == 200
+        assert response.json()["exists_in_db"] is True
+        assert response.json()["track_id"] == str(url_match_id)
+
+        query = self.db.execute.call_args.args[0]
+        sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        where, order_by = sql.split("ORDER BY")
+        assert "tracks.soundcloud_url = 'https://soundcloud.com/artist/track'" in where
+        assert "tracks.soundcloud_track_id = '123'" in where
+        # A NULL soundcloud_url on the ID-only row must not sort ahead of the URL match
+        assert "coalesce(tracks.soundcloud_url = 'https://soundcloud.com/artist/track', false) DESC" in order_by
+
+    def test_id_only_lookup_has_no_url_ordering(self):
+        """
+        Tests that without an upstream URL the lookup matches on platform ID alone.
+        """
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = None
+        self.db.execute.return_value = result
+
+        with patch.object(track_search.spotify_search, "resolve_spotify_url", AsyncMock(return_value={
+            "id": "sp123",
+        })):
+            response = self.client.get("/api/tracks/resolve-url", params={"url": "spotify:track:sp123"})
+
+        assert response.status_code == 200
+        assert response.json()["exists_in_db"] is False
+        sql = str(self.db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "ORDER BY" not in sql